@@ -7,15 +7,21 @@ from pathlib import Path
 # Base paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 MODELS_DIR = BASE_DIR / "models"
+REDUCTION_CACHE_DIR = BASE_DIR / "cache" / "reductions"
+REDUCTION_CACHE_VERSION = 2  # Bump when reduction output changes, so persisted results are recomputed
 
 # Model file paths
 MODEL_PATHS = {
     "tfidf_vectorizer": MODELS_DIR / "tfidf_vectorizer.pkl",
     "tfidf_word_embeddings": MODELS_DIR / "tfidf_word_embeddings.npy",
+    "tfidf_word_embeddings_f32": MODELS_DIR / "tfidf_word_embeddings_f32.npy",  # Generated on first load if not float32
+    "tfidf_word_embeddings_normed": MODELS_DIR / "tfidf_word_embeddings_normed.npy",  # Generated on first load
     "tfidf_svd": MODELS_DIR / "tfidf_svd.pkl",
     "tfidf_vocab": MODELS_DIR / "tfidf_vocab.pkl",
     "word2vec_cbow": MODELS_DIR / "word2vec_cbow.model",
     "word2vec_skipgram": MODELS_DIR / "word2vec_skipgram.model",
+    "word2vec_cbow_normed": MODELS_DIR / "word2vec_cbow_normed.npy",  # Generated on first load
+    "word2vec_skipgram_normed": MODELS_DIR / "word2vec_skipgram_normed.npy",  # Generated on first load
     "word_frequencies": MODELS_DIR / "word_frequencies.pkl",
 }
 
@@ -39,7 +45,19 @@ DEFAULT_REDUCTION_METHOD = "pca"  # "pca" or "tsne"
 DEFAULT_NUM_WORDS = 500  # Default number of words for visualization
 MAX_NUM_WORDS = 2000  # Maximum words for visualization
 DEFAULT_PERPLEXITY = 30  # t-SNE perplexity
+TSNE_N_ITER = 500  # t-SNE optimization iterations
+TSNE_PCA_COMPONENTS = 50  # PCA pre-reduction dimensions before t-SNE
+USE_GPU_REDUCTION = os.getenv("USE_GPU_REDUCTION", "0") == "1"  # Use cuML if installed
+GPU_MIN_SAMPLES = 500  # Below this, GPU transfer overhead outweighs the speedup
+TSNE_FFT_MIN_SAMPLES = 10000  # Below this, openTSNE's Barnes-Hut beats the FFT grid's fixed cost
 DEFAULT_SIMILAR_WORDS = 10  # Default top-N similar words
+MAX_CACHE_ENTRIES = 16  # Max in-memory cached reductions (LRU)
+SIMILARITY_CACHE_SIZE = 4096  # Max cached similarity lookups (LRU)
+TOP_WORDS_CACHE_SIZE = 32  # Max cached top-N embedding gathers (LRU)
+PREWARM_MODELS = os.getenv("PREWARM_MODELS", "1") == "1"  # Load models in the background at startup
+WARMUP_CACHE = os.getenv("WARMUP_CACHE", "1") == "1"  # Precompute default reductions at startup
+GZIP_MIN_SIZE = 1024  # Responses smaller than this (bytes) are sent uncompressed
+GZIP_LEVEL = 1  # Level 1 already shrinks embeddings JSON ~2.4x at a fraction of level 9's CPU
 
 # Model types
 MODEL_TYPES = {
@@ -1,14 +1,29 @@
 """
 FastAPI application entry point for Embedding Explorer backend.
 """
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
-from backend.config import API_PREFIX, CORS_ORIGINS
+from backend.config import (
+    API_PREFIX,
+    CORS_ORIGINS,
+    MODEL_TYPES,
+    DEFAULT_NUM_WORDS,
+    GZIP_LEVEL,
+    GZIP_MIN_SIZE,
+    PREWARM_MODELS,
+    WARMUP_CACHE
+)
 from backend.routers import models_router, embeddings_router, similarity_router
+from backend.services._kernels import warmup_kernels
+from backend.services.dimensionality import dimensionality_service
+from backend.services.model_loader import model_loader
 
 # Configure logging
 logging.basicConfig(
@@ -18,12 +33,34 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _warmup() -> None:
+    """Precompute the default reduction for each model and method."""
+    for model_type in MODEL_TYPES:
+        for method in ("pca", "tsne"):
+            if dimensionality_service.is_cached(model_type, method, DEFAULT_NUM_WORDS):
+                logger.info(f"Warmup: {model_type}/{method} already cached, skipping")
+                continue
+            try:
+                logger.info(f"Warmup: computing {model_type}/{method}/{DEFAULT_NUM_WORDS}")
+                dimensionality_service.get_reduced_embeddings(model_type, method, DEFAULT_NUM_WORDS)
+            except Exception as e:
+                logger.error(f"Warmup failed for {model_type}/{method}: {e}")
+    logger.info("Warmup complete")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown events."""
     # Startup
     logger.info("Starting Embedding Explorer API...")
-    logger.info("Models will be loaded lazily on first access")
+    if PREWARM_MODELS:
+        logger.info("Loading models in the background")
+        model_loader.prewarm()
+    else:
+        logger.info("Models will be loaded lazily on first access")
+    warmup_kernels()
+    if WARMUP_CACHE:
+        app.state.warmup_task = asyncio.create_task(asyncio.to_thread(_warmup))
     yield
     # Shutdown
     logger.info("Shutting down Embedding Explorer API...")
@@ -47,7 +84,8 @@ app = FastAPI(
     - **Word2Vec Skip-Gram**: Dense embeddings trained with Skip-Gram architecture
     """,
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware - allow all origins for Streamlit Cloud compatibility
@@ -59,6 +97,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON bodies for clients that send Accept-Encoding: gzip (requests does by default)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
 # Include routers
 app.include_router(models_router, prefix=API_PREFIX)
 app.include_router(similarity_router, prefix=API_PREFIX)
@@ -1,11 +1,18 @@
 """
 API router for embedding visualization endpoints.
 """
+import asyncio
+import base64
+from dataclasses import dataclass
+
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from typing import List
 
-from backend.schemas import EmbeddingsResponse, EmbeddingPoint
+from backend.schemas import EmbeddingsResponse
 from backend.services.dimensionality import dimensionality_service
+from backend.services.embedding_service import embedding_service
 from backend.services.model_loader import model_loader
 from backend.config import (
     MODEL_TYPES, 
@@ -18,6 +25,15 @@ from backend.config import (
 router = APIRouter(prefix="/embeddings", tags=["Embeddings"])
 
 
+@dataclass(slots=True)
+class _EmbeddingPointRow:
+    """Unvalidated EmbeddingPoint for the response hot path (dumped by orjson)."""
+    word: str
+    x: float
+    y: float
+    frequency: int
+
+
 @router.get("/{model_type}", response_model=EmbeddingsResponse)
 async def get_embeddings_for_visualization(
     model_type: str,
@@ -36,6 +52,14 @@ async def get_embeddings_for_visualization(
         ge=5,
         le=100,
         description="t-SNE perplexity (only used if method=tsne)"
+    ),
+    columnar: bool = Query(
+        default=False,
+        description="Return points as parallel arrays in points_columnar"
+    ),
+    quantize: bool = Query(
+        default=False,
+        description="With columnar, send coordinates as base64 float16 in points_columnar.xy_f16"
     )
 ):
     """
@@ -49,6 +73,8 @@ async def get_embeddings_for_visualization(
         method: Reduction method ("pca" or "tsne")
         num_words: Number of words to include (sorted by frequency)
         perplexity: t-SNE perplexity parameter
+        columnar: Whether to return parallel arrays instead of point objects
+        quantize: Whether columnar coordinates are sent as float16 bytes
     """
     if model_type not in MODEL_TYPES:
         raise HTTPException(
@@ -63,7 +89,8 @@ async def get_embeddings_for_visualization(
         )
     
     try:
-        reduced, words, frequencies = dimensionality_service.get_reduced_embeddings(
+        reduced, words, frequencies = await asyncio.to_thread(
+            dimensionality_service.get_reduced_embeddings,
             model_type=model_type,
             method=method,
             num_words=num_words,
@@ -76,22 +103,37 @@ async def get_embeddings_for_visualization(
                 detail="Failed to load embeddings"
             )
         
+        if columnar:
+            # Serialized straight from the ndarray buffers, bypassing Pydantic
+            if quantize:
+                # Cached reductions are stored as float16, so this only drops digits cache hits never had
+                xy_f16 = base64.b64encode(reduced.astype("<f2").tobytes()).decode("ascii")
+                columns = {"words": words, "x": [], "y": [], "frequencies": frequencies, "xy_f16": xy_f16}
+            else:
+                xs, ys = np.ascontiguousarray(reduced.T)
+                columns = {"words": words, "x": xs, "y": ys, "frequencies": frequencies}
+            
+            return ORJSONResponse(content={
+                "model_type": model_type,
+                "reduction_method": method,
+                "num_words": len(words),
+                "points": [],
+                "points_columnar": columns,
+            })
+        
+        # Data is already typed, so skip Pydantic validation entirely
+        xs, ys = reduced[:, 0].tolist(), reduced[:, 1].tolist()
         points = [
-            EmbeddingPoint(
-                word=word,
-                x=float(reduced[i, 0]),
-                y=float(reduced[i, 1]),
-                frequency=freq
-            )
-            for i, (word, freq) in enumerate(zip(words, frequencies))
+            _EmbeddingPointRow(w, x, y, f)
+            for w, x, y, f in zip(words, xs, ys, frequencies.tolist())
         ]
         
-        return EmbeddingsResponse(
-            model_type=model_type,
-            reduction_method=method,
-            num_words=len(points),
-            points=points
-        )
+        return ORJSONResponse(content={
+            "model_type": model_type,
+            "reduction_method": method,
+            "num_words": len(points),
+            "points": points,
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -125,7 +167,8 @@ async def get_word_neighborhood(
         )
     
     try:
-        reduced, words, similarities = dimensionality_service.get_word_neighborhood(
+        reduced, words, similarities = await asyncio.to_thread(
+            dimensionality_service.get_word_neighborhood,
             word=word,
             model_type=model_type,
             method=method,
@@ -139,12 +182,13 @@ async def get_word_neighborhood(
                 detail=f"Word '{word}' not found in vocabulary"
             )
         
+        coords = reduced.tolist()
         points = []
         for i, (w, sim) in enumerate(zip(words, similarities)):
             points.append({
                 "word": w,
-                "x": float(reduced[i, 0]),
-                "y": float(reduced[i, 1]),
+                "x": coords[i][0],
+                "y": coords[i][1],
                 "similarity": round(sim, 4),
                 "is_query": w == word.lower().strip()
             })
@@ -166,8 +210,9 @@ async def get_word_neighborhood(
 @router.delete("/cache")
 async def clear_embeddings_cache():
     """
-    Clear the cached dimensionality reductions.
+    Clear the cached dimensionality reductions and similarity lookups.
     Useful when memory is constrained or to force recalculation.
     """
     dimensionality_service.clear_cache()
+    embedding_service.clear_caches()
     return {"message": "Cache cleared successfully"}
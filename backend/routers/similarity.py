@@ -93,11 +93,10 @@ async def get_similar_words_batch(
             detail="Maximum 20 words per batch"
         )
     
+    batch_results = embedding_service.get_similar_words_batch(words, model_type, topn)
+    
     results = []
-    for word in words:
-        similar_words, in_vocab, message = embedding_service.get_similar_words(
-            word, model_type, topn
-        )
+    for word, (similar_words, in_vocab, message) in zip(words, batch_results):
         results.append({
             "query_word": word.lower().strip(),
             "similar_words": [{"word": w, "similarity": round(s, 4)} for w, s in similar_words],
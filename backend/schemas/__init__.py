@@ -4,6 +4,7 @@ from .responses import (
     SimilarWord,
     SimilarityResponse,
     EmbeddingPoint,
+    EmbeddingColumns,
     EmbeddingsResponse,
     VocabularyInfo,
     ComparisonResult,
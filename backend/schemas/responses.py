@@ -37,12 +37,22 @@ class EmbeddingPoint(BaseModel):
     frequency: Optional[int] = Field(None, description="Word frequency in corpus")
 
 
+class EmbeddingColumns(BaseModel):
+    """Embedding points as parallel arrays (one entry per word)."""
+    words: List[str] = Field(..., description="The words")
+    x: List[float] = Field(..., description="X coordinates (empty if quantized)")
+    y: List[float] = Field(..., description="Y coordinates (empty if quantized)")
+    frequencies: List[int] = Field(..., description="Word frequencies in corpus")
+    xy_f16: Optional[str] = Field(None, description="Base64 little-endian float16 (x, y) pairs (if quantized)")
+
+
 class EmbeddingsResponse(BaseModel):
     """Response containing embeddings for visualization."""
     model_type: str = Field(..., description="Model used for embeddings")
     reduction_method: str = Field(..., description="Dimensionality reduction method (pca/tsne)")
     num_words: int = Field(..., description="Number of words included")
-    points: List[EmbeddingPoint] = Field(..., description="List of embedding points")
+    points: List[EmbeddingPoint] = Field(..., description="List of embedding points (empty if columnar)")
+    points_columnar: Optional[EmbeddingColumns] = Field(None, description="Points as parallel arrays (if columnar)")
 
 
 class VocabularyInfo(BaseModel):
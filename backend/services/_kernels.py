@@ -0,0 +1,129 @@
+"""
+Compiled kernels for similarity search.
+
+Uses Numba when installed and falls back to NumPy otherwise.
+"""
+import logging
+import os
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import config as numba_config, njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    from scipy.linalg.blas import sgemv
+    HAS_SCIPY_BLAS = True
+except ImportError:
+    HAS_SCIPY_BLAS = False
+
+if HAS_NUMBA and "NUMBA_THREADING_LAYER" not in os.environ:
+    # Kernels run on server worker threads; prefer OpenMP since TBB can hang interpreter exit there
+    numba_config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+logger = logging.getLogger(__name__)
+
+# Below any cosine similarity; a finite sentinel keeps fastmath's no-inf assumption valid
+_SENTINEL = -3.0
+_N_CHUNKS = 64
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _topk_cosine_numba(embnorm, q, k, exclude_idx):
+        n_rows, dim = embnorm.shape
+        n_chunks = min(_N_CHUNKS, n_rows)
+        chunk_size = (n_rows + n_chunks - 1) // n_chunks
+
+        # Per-chunk top-k buffers, kept sorted descending by insertion
+        best_scores = np.full((n_chunks, k), _SENTINEL, dtype=np.float32)
+        best_idx = np.full((n_chunks, k), -1, dtype=np.int64)
+
+        for c in prange(n_chunks):
+            start = c * chunk_size
+            stop = min(start + chunk_size, n_rows)
+            for i in range(start, stop):
+                if i == exclude_idx:
+                    continue
+                score = np.float32(0.0)
+                for j in range(dim):
+                    score += embnorm[i, j] * q[j]
+                if score <= best_scores[c, k - 1]:
+                    continue
+                pos = k - 1
+                while pos > 0 and best_scores[c, pos - 1] < score:
+                    best_scores[c, pos] = best_scores[c, pos - 1]
+                    best_idx[c, pos] = best_idx[c, pos - 1]
+                    pos -= 1
+                best_scores[c, pos] = score
+                best_idx[c, pos] = i
+
+        # Merge the per-chunk candidates
+        flat_scores = best_scores.ravel()
+        flat_idx = best_idx.ravel()
+        order = np.argsort(-flat_scores)[:k]
+        top_idx = flat_idx[order]
+        top_scores = flat_scores[order]
+        valid = top_idx >= 0
+        return top_idx[valid], top_scores[valid]
+
+
+def _topk_cosine_numpy(
+    embnorm: np.ndarray,
+    q: np.ndarray,
+    k: int,
+    exclude_idx: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    if HAS_SCIPY_BLAS and embnorm.dtype == np.float32 and embnorm.flags.c_contiguous:
+        # Direct BLAS call; the transpose of a C-ordered matrix is Fortran-ordered, so no copy
+        similarities = sgemv(1.0, embnorm.T, q, trans=1)
+    else:
+        similarities = embnorm @ q
+    if 0 <= exclude_idx < len(similarities):
+        similarities[exclude_idx] = -np.inf
+    k = min(k, len(similarities) - (1 if 0 <= exclude_idx < len(similarities) else 0))
+    if k <= 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+    top = np.argpartition(similarities, -k)[-k:]
+    top = top[np.argsort(-similarities[top])]
+    return top, similarities[top]
+
+
+def topk_cosine(
+    embnorm: np.ndarray,
+    q: np.ndarray,
+    k: int,
+    exclude_idx: int = -1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k rows most similar to a query in a row-normalized matrix.
+
+    Args:
+        embnorm: L2-normalized float32 embeddings (V x D)
+        q: L2-normalized float32 query vector (D,)
+        k: Number of results
+        exclude_idx: Row to leave out (usually the query word), -1 for none
+
+    Returns:
+        Tuple of (row indices, cosine similarities), sorted descending
+    """
+    if k <= 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+    if HAS_NUMBA:
+        # np.asarray drops the memmap subclass so Numba sees a plain array
+        return _topk_cosine_numba(np.asarray(embnorm), np.asarray(q), k, exclude_idx)
+    return _topk_cosine_numpy(embnorm, q, k, exclude_idx)
+
+
+def warmup_kernels() -> None:
+    """Compile the kernels ahead of the first request."""
+    if not HAS_NUMBA:
+        return
+    dummy = np.eye(4, 2, dtype=np.float32)
+    dummy.flags.writeable = False  # Match the read-only memory-mapped matrix signature
+    topk_cosine(dummy, dummy[0], 2, 0)
+    logger.info("Numba similarity kernel compiled")
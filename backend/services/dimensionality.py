@@ -2,19 +2,55 @@
 Dimensionality reduction service for PCA and t-SNE.
 """
 import logging
-from typing import List, Tuple, Optional
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
 import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
 
+import joblib
 import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.manifold import TSNE
 
+try:
+    from openTSNE import TSNE as OpenTSNE
+    HAS_OPENTSNE = True
+except ImportError:
+    HAS_OPENTSNE = False
+
+try:
+    from cuml import PCA as cuPCA, TSNE as cuTSNE
+    HAS_CUML = True
+except ImportError:
+    HAS_CUML = False
+
 from backend.services.embedding_service import embedding_service
 from backend.services.model_loader import model_loader
-from backend.config import DEFAULT_PERPLEXITY
+from backend.config import (
+    DEFAULT_PERPLEXITY,
+    TSNE_N_ITER,
+    TSNE_PCA_COMPONENTS,
+    MODEL_PATHS,
+    REDUCTION_CACHE_DIR,
+    REDUCTION_CACHE_VERSION,
+    USE_GPU_REDUCTION,
+    GPU_MIN_SAMPLES,
+    TSNE_FFT_MIN_SAMPLES,
+    MAX_CACHE_ENTRIES
+)
 
 logger = logging.getLogger(__name__)
 
+# Model files each reduction is computed from; their mtime and size key the disk cache
+_SOURCE_FILES = {
+    "tfidf": ("tfidf_word_embeddings", "tfidf_vocab", "word_frequencies"),
+    "word2vec_cbow": ("word2vec_cbow", "word_frequencies"),
+    "word2vec_skipgram": ("word2vec_skipgram", "word_frequencies"),
+}
+
 
 class DimensionalityReductionService:
     """
@@ -25,7 +61,10 @@ class DimensionalityReductionService:
     def __init__(self):
         self.embedding_service = embedding_service
         self.loader = model_loader
-        self._cache = {}  # Cache for reduced embeddings
+        self._cache: OrderedDict = OrderedDict()  # LRU cache for reduced embeddings
+        self._cache_lock = threading.Lock()  # Requests are served from worker threads
+        self.cache_dir = REDUCTION_CACHE_DIR
+        self._pca_models: Dict[str, PCA] = {}  # PCA fitted on each model's full vocabulary
     
     def _get_cache_key(
         self, 
@@ -33,10 +72,96 @@ class DimensionalityReductionService:
         method: str, 
         num_words: int,
         perplexity: int = DEFAULT_PERPLEXITY
-    ) -> str:
+    ) -> Tuple[str, str, int, int]:
         """Generate a cache key for the reduction parameters."""
-        key_str = f"{model_type}_{method}_{num_words}_{perplexity}"
-        return hashlib.md5(key_str.encode()).hexdigest()
+        if method == "pca":
+            perplexity = 0  # PCA ignores perplexity
+        return (model_type, method, num_words, perplexity)
+    
+    def _get_cache_path(self, cache_key: Tuple[str, str, int, int]) -> Path:
+        """
+        Get the on-disk path for a cache key.
+        
+        The hash also covers REDUCTION_CACHE_VERSION and the source model files'
+        mtime and size, so retrained models or changed reduction code miss
+        instead of serving stale results.
+        """
+        parts = [REDUCTION_CACHE_VERSION, *cache_key]
+        for name in _SOURCE_FILES.get(cache_key[0], ()):
+            try:
+                stat = MODEL_PATHS[name].stat()
+                parts += [stat.st_mtime_ns, stat.st_size]
+            except OSError:
+                parts.append(None)
+        key_str = "_".join(str(part) for part in parts)
+        digest = hashlib.blake2b(key_str.encode(), digest_size=8).hexdigest()
+        return self.cache_dir / f"{digest}.pkl"
+    
+    def _pack(self, result: Tuple[np.ndarray, List[str], np.ndarray]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Quantize coordinates to float16 for cache storage."""
+        reduced, words, frequencies = result
+        return reduced.astype(np.float16), words, frequencies
+    
+    def _unpack(self, result: Tuple[np.ndarray, List[str], np.ndarray]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Widen cached coordinates back to float32."""
+        reduced, words, frequencies = result
+        return reduced.astype(np.float32), words, np.asarray(frequencies, dtype=np.int32)
+    
+    def _cache_put(self, cache_key: Tuple[str, str, int, int], packed: Tuple[np.ndarray, List[str], np.ndarray]) -> None:
+        """Insert into the in-memory cache, evicting the least recently used entry."""
+        with self._cache_lock:
+            self._cache[cache_key] = packed
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > MAX_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+    
+    def _cache_get(self, cache_key: Tuple[str, str, int, int]) -> Optional[Tuple[np.ndarray, List[str], np.ndarray]]:
+        """Look up the in-memory cache and mark the entry as recently used."""
+        with self._cache_lock:
+            packed = self._cache.get(cache_key)
+            if packed is not None:
+                self._cache.move_to_end(cache_key)
+            return packed
+    
+    def is_cached(
+        self,
+        model_type: str,
+        method: str,
+        num_words: int,
+        perplexity: int = DEFAULT_PERPLEXITY
+    ) -> bool:
+        """Check whether a reduction is already cached in memory or on disk."""
+        cache_key = self._get_cache_key(model_type, method, num_words, perplexity)
+        return self._cache_get(cache_key) is not None or self._get_cache_path(cache_key).exists()
+    
+    def _load_from_disk(self, cache_key: Tuple[str, str, int, int]) -> Optional[Tuple[np.ndarray, List[str], np.ndarray]]:
+        """Load a persisted reduction result, if present."""
+        path = self._get_cache_path(cache_key)
+        if not path.exists():
+            return None
+        
+        try:
+            return joblib.load(str(path))
+        except Exception as e:
+            logger.warning(f"Failed to load cached reduction {path}: {e}")
+            return None
+    
+    def _save_to_disk(self, cache_key: Tuple[str, str, int, int], result: Tuple[np.ndarray, List[str], np.ndarray]) -> None:
+        """Persist a reduction result so it survives restarts."""
+        path = self._get_cache_path(cache_key)
+        # Write then rename so workers persisting the same key never interleave or expose a partial file
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            joblib.dump(result, str(tmp_path), compress=3)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Failed to persist reduction {cache_key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def _use_gpu(self, embeddings: np.ndarray) -> bool:
+        """Whether to run the reduction on GPU via cuML."""
+        return USE_GPU_REDUCTION and HAS_CUML and embeddings.shape[0] >= GPU_MIN_SAMPLES
     
     def reduce_pca(
         self, 
@@ -55,18 +180,70 @@ class DimensionalityReductionService:
         """
         logger.info(f"Applying PCA reduction: {embeddings.shape} -> {n_components}D")
         
-        pca = PCA(n_components=n_components, random_state=42)
-        reduced = pca.fit_transform(embeddings)
+        if self._use_gpu(embeddings):
+            pca = cuPCA(n_components=n_components, random_state=42)
+        else:
+            pca = PCA(n_components=n_components, random_state=42)
+        reduced = np.asarray(pca.fit_transform(embeddings))
         
         logger.info(f"PCA explained variance ratio: {pca.explained_variance_ratio_.sum():.4f}")
         
-        return reduced
+        return reduced.astype(np.float32, copy=False)
+    
+    def reduce_pca_for_model(
+        self,
+        model_type: str,
+        embeddings: np.ndarray
+    ) -> np.ndarray:
+        """
+        Project embeddings onto a PCA basis fitted once on the model's full vocabulary.
+        
+        Args:
+            model_type: Model type the embeddings belong to
+            embeddings: Subset of the model's embeddings
+            
+        Returns:
+            Reduced embeddings
+        """
+        pca = self._pca_models.get(model_type)
+        if pca is None:
+            _, matrix = self.embedding_service.get_embedding_matrix(model_type)
+            if matrix is None:
+                return self.reduce_pca(embeddings)
+            
+            logger.info(f"Fitting PCA basis for {model_type}: {matrix.shape} -> 2D")
+            pca = cuPCA(n_components=2, random_state=42) if self._use_gpu(matrix) else PCA(n_components=2, random_state=42)
+            pca.fit(matrix)
+            self._pca_models[model_type] = pca
+        
+        return np.asarray(pca.transform(embeddings), dtype=np.float32)
+    
+    def _pre_reduce(
+        self,
+        embeddings: np.ndarray,
+        pca_preprocess: bool = True,
+        components_sorted: bool = False
+    ) -> np.ndarray:
+        """Reduce embeddings to TSNE_PCA_COMPONENTS dims before t-SNE."""
+        n_samples, n_features = embeddings.shape
+        if not pca_preprocess or n_features <= TSNE_PCA_COMPONENTS or n_samples <= TSNE_PCA_COMPONENTS:
+            return embeddings
+        
+        if components_sorted:
+            # LSA vectors are already the leading SVD components
+            return embeddings[:, :TSNE_PCA_COMPONENTS]
+        
+        logger.info(f"PCA pre-reduction before t-SNE: {n_features} -> {TSNE_PCA_COMPONENTS} dims")
+        return PCA(n_components=TSNE_PCA_COMPONENTS, random_state=42).fit_transform(embeddings)
     
     def reduce_tsne(
         self, 
         embeddings: np.ndarray,
         n_components: int = 2,
-        perplexity: int = DEFAULT_PERPLEXITY
+        perplexity: int = DEFAULT_PERPLEXITY,
+        pca_preprocess: bool = True,
+        components_sorted: bool = False,
+        n_iter: int = TSNE_N_ITER
     ) -> np.ndarray:
         """
         Reduce embeddings using t-SNE.
@@ -75,33 +252,74 @@ class DimensionalityReductionService:
             embeddings: High-dimensional embeddings matrix
             n_components: Number of output dimensions
             perplexity: t-SNE perplexity parameter
+            pca_preprocess: Whether to pre-reduce to TSNE_PCA_COMPONENTS dims first
+            components_sorted: Whether columns are already ordered by explained
+                variance (e.g. TruncatedSVD output), so the leading columns can
+                be used directly instead of refitting PCA
+            n_iter: Number of optimization iterations
             
         Returns:
             Reduced embeddings
         """
+        embeddings = self._pre_reduce(embeddings, pca_preprocess, components_sorted)
+        
         # Adjust perplexity if needed (must be < n_samples)
         n_samples = embeddings.shape[0]
         adjusted_perplexity = min(perplexity, max(5, (n_samples - 1) // 3))
         
         logger.info(f"Applying t-SNE reduction: {embeddings.shape} -> {n_components}D (perplexity={adjusted_perplexity})")
         
-        try:
-            # Try newer sklearn API first
-            tsne = TSNE(
-                n_components=n_components,
-                perplexity=adjusted_perplexity,
-                random_state=42,
-                n_iter=1000,
-                init='random'  # 'pca' can fail with some data
-            )
-            reduced = tsne.fit_transform(embeddings)
-        except Exception as e:
-            logger.error(f"t-SNE failed: {e}")
+        if self._use_gpu(embeddings):
+            try:
+                tsne = cuTSNE(
+                    n_components=n_components,
+                    perplexity=adjusted_perplexity,
+                    random_state=42
+                )
+                return np.asarray(tsne.fit_transform(embeddings), dtype=np.float32)
+            except Exception as e:
+                logger.error(f"cuML t-SNE failed: {e}")
+                logger.info("Falling back to CPU t-SNE")
+        
+        if HAS_OPENTSNE:
+            try:
+                # Multicore t-SNE; the FFT grid only pays off on large sets
+                tsne = OpenTSNE(
+                    n_components=n_components,
+                    perplexity=adjusted_perplexity,
+                    n_iter=n_iter,
+                    n_jobs=-1,
+                    negative_gradient_method="fft" if n_samples >= TSNE_FFT_MIN_SAMPLES else "bh",
+                    initialization="pca",
+                    random_state=42
+                )
+                return np.asarray(tsne.fit(embeddings), dtype=np.float32)
+            except Exception as e:
+                logger.error(f"openTSNE failed: {e}")
+                logger.info("Falling back to sklearn t-SNE")
+        
+        # 'pca' init converges faster but can fail with degenerate data
+        for init in ("pca", "random"):
+            try:
+                tsne = TSNE(
+                    n_components=n_components,
+                    perplexity=adjusted_perplexity,
+                    early_exaggeration=12,
+                    learning_rate="auto",
+                    random_state=42,
+                    max_iter=n_iter,
+                    init=init
+                )
+                reduced = tsne.fit_transform(embeddings)
+                break
+            except Exception as e:
+                logger.error(f"t-SNE failed (init={init}): {e}")
+        else:
             # Fallback to PCA if t-SNE fails
             logger.info("Falling back to PCA")
             reduced = self.reduce_pca(embeddings, n_components)
         
-        return reduced
+        return reduced.astype(np.float32, copy=False)
     
     def get_reduced_embeddings(
         self,
@@ -110,7 +328,7 @@ class DimensionalityReductionService:
         num_words: int = 500,
         perplexity: int = DEFAULT_PERPLEXITY,
         use_cache: bool = True
-    ) -> Tuple[np.ndarray, List[str], List[int]]:
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
         """
         Get reduced 2D embeddings for visualization.
         
@@ -127,34 +345,47 @@ class DimensionalityReductionService:
         cache_key = self._get_cache_key(model_type, method, num_words, perplexity)
         
         # Check cache
-        if use_cache and cache_key in self._cache:
-            logger.info(f"Using cached reduction for {model_type}/{method}/{num_words}")
-            return self._cache[cache_key]
+        if use_cache:
+            packed = self._cache_get(cache_key)
+            if packed is not None:
+                logger.info(f"Using cached reduction for {model_type}/{method}/{num_words}")
+                return self._unpack(packed)
+            
+            # Check disk cache
+            packed = self._load_from_disk(cache_key)
+            if packed is not None:
+                logger.info(f"Loaded persisted reduction for {model_type}/{method}/{num_words}")
+                self._cache_put(cache_key, packed)
+                return self._unpack(packed)
         
         # Get embeddings
         embeddings, words = self.embedding_service.get_all_embeddings(model_type, num_words)
         
         if len(words) == 0:
             logger.warning(f"No embeddings found for {model_type}")
-            return np.array([]), [], []
+            return np.array([]), [], np.array([], dtype=np.int32)
         
         # Apply dimensionality reduction
         if method == "pca":
-            reduced = self.reduce_pca(embeddings)
+            reduced = self.reduce_pca_for_model(model_type, embeddings)
         elif method == "tsne":
-            reduced = self.reduce_tsne(embeddings, perplexity=perplexity)
+            reduced = self.reduce_tsne(
+                embeddings,
+                perplexity=perplexity,
+                components_sorted=(model_type == "tfidf")
+            )
         else:
             raise ValueError(f"Unknown reduction method: {method}")
         
-        # Get word frequencies
-        frequencies = self.loader.get_word_frequencies()
-        word_freqs = [frequencies.get(w, 0) for w in words]
+        # Get word frequencies (aligned with the frequency-sorted words)
+        _, word_freqs = self.loader.get_top_n(model_type, num_words)
         
-        # Cache result
-        result = (reduced, words, word_freqs)
-        self._cache[cache_key] = result
+        # Cache result (quantized); return it the way a hit would, so every call gets the same values
+        packed = self._pack((reduced, words, word_freqs))
+        self._cache_put(cache_key, packed)
+        self._save_to_disk(cache_key, packed)
         
-        return result
+        return self._unpack(packed)
     
     def get_word_neighborhood(
         self,
@@ -189,36 +420,30 @@ class DimensionalityReductionService:
         words = [word] + [w for w, _ in similar_words]
         similarities = [1.0] + [s for _, s in similar_words]
         
-        # Get vectors for all words
-        vectors = []
-        valid_words = []
-        valid_similarities = []
-        
-        for w, sim in zip(words, similarities):
-            vec = self.embedding_service.get_word_vector(w, model_type)
-            if vec is not None:
-                vectors.append(vec)
-                valid_words.append(w)
-                valid_similarities.append(sim)
+        # Get vectors for all words in one gather
+        embeddings, mask = self.embedding_service.get_word_vectors_batch(words, model_type)
+        valid_words = [w for w, ok in zip(words, mask) if ok]
+        valid_similarities = [s for s, ok in zip(similarities, mask) if ok]
         
-        if len(vectors) < 2:
+        if len(valid_words) < 2:
             return np.array([]), [], []
         
-        embeddings = np.array(vectors)
-        
         # Apply reduction
         if method == "pca":
             reduced = self.reduce_pca(embeddings)
         else:
             # For small sets, use lower perplexity
-            adj_perplexity = min(perplexity, max(2, len(vectors) // 3))
+            adj_perplexity = min(perplexity, max(2, len(valid_words) // 3))
             reduced = self.reduce_tsne(embeddings, perplexity=adj_perplexity)
         
         return reduced, valid_words, valid_similarities
     
     def clear_cache(self) -> None:
-        """Clear the reduction cache."""
-        self._cache.clear()
+        """Clear the reduction cache, including persisted results."""
+        with self._cache_lock:
+            self._cache.clear()
+        self._pca_models.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
         logger.info("Dimensionality reduction cache cleared")
 
 
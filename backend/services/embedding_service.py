@@ -2,11 +2,13 @@
 Embedding service for similarity calculations and vector operations.
 """
 import logging
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 
+from backend.config import SIMILARITY_CACHE_SIZE, TOP_WORDS_CACHE_SIZE
+from backend.services._kernels import topk_cosine
 from backend.services.model_loader import model_loader
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,29 @@ class EmbeddingService:
     
     def __init__(self):
         self.loader = model_loader
+        
+        # Per-instance LRU caches; lookups raise on failure so errors are never cached
+        self._similar_tfidf_cached = lru_cache(maxsize=SIMILARITY_CACHE_SIZE)(
+            self._lookup_similar_words_tfidf
+        )
+        self._similar_word2vec_cached = lru_cache(maxsize=SIMILARITY_CACHE_SIZE)(
+            self._lookup_similar_words_word2vec
+        )
+        self._top_words_cached = lru_cache(maxsize=TOP_WORDS_CACHE_SIZE)(
+            self._top_words_and_embeddings
+        )
+    
+    def clear_caches(self):
+        """Invalidate cached similarity results and top-word gathers, e.g. after a model reload."""
+        self._similar_tfidf_cached.cache_clear()
+        self._similar_word2vec_cached.cache_clear()
+        self._top_words_cached.cache_clear()
+        logger.info("Embedding service caches cleared")
+    
+    @staticmethod
+    def _normalize(word: str) -> str:
+        """Normalize a query word; applied once at each public entry point."""
+        return word.lower().strip()
     
     def get_similar_words_tfidf(
         self, 
@@ -31,40 +56,43 @@ class EmbeddingService:
         Returns:
             Tuple of (similar_words, in_vocabulary, error_message)
         """
-        word = word.lower().strip()
-        
+        return self._similar_words_tfidf(self._normalize(word), topn)
+    
+    def _similar_words_tfidf(
+        self,
+        word: str,
+        topn: int
+    ) -> Tuple[List[Tuple[str, float]], bool, Optional[str]]:
+        """TF-IDF similarity for an already-normalized word."""
         try:
-            vocab = self.loader.get_tfidf_vocab()
-            embeddings = self.loader.get_tfidf_embeddings()
-            idx_to_word = self.loader.get_tfidf_idx_to_word()
-            
-            if word not in vocab:
-                return [], False, f"Word '{word}' not found in TF-IDF vocabulary"
-            
-            word_idx = vocab[word]
-            word_vector = embeddings[word_idx].reshape(1, -1)
-            
-            # Calculate cosine similarity with all words
-            similarities = cosine_similarity(word_vector, embeddings)[0]
-            
-            # Get top N similar words (excluding the word itself)
-            top_indices = similarities.argsort()[::-1]
-            
-            results = []
-            for idx in top_indices:
-                if len(results) >= topn:
-                    break
-                if idx != word_idx:
-                    similar_word = idx_to_word[idx]
-                    similarity_score = float(similarities[idx])
-                    results.append((similar_word, similarity_score))
-            
-            return results, True, None
+            results, in_vocab, message = self._similar_tfidf_cached(word, topn)
+            return list(results), in_vocab, message
             
         except Exception as e:
             logger.error(f"Error in TF-IDF similarity: {e}")
             return [], False, str(e)
     
+    def _lookup_similar_words_tfidf(
+        self,
+        word: str,
+        topn: int
+    ) -> Tuple[Tuple[Tuple[str, float], ...], bool, Optional[str]]:
+        """Uncached TF-IDF similarity lookup returning hashable results."""
+        vocab = self.loader.get_tfidf_vocab()
+        normed = self.loader.get_tfidf_embeddings_normalized()
+        idx_to_word = self.loader.get_tfidf_idx_to_word()
+        
+        word_idx = vocab.get(word)
+        if word_idx is None:
+            return (), False, f"Word '{word}' not found in TF-IDF vocabulary"
+        
+        # Fused dot product + top-N over pre-normalized rows (excluding the word itself)
+        top_indices, top_scores = topk_cosine(normed, normed[word_idx], topn, word_idx)
+        
+        results = tuple(zip(idx_to_word[top_indices].tolist(), top_scores.tolist()))
+        
+        return results, True, None
+    
     def get_similar_words_word2vec(
         self, 
         word: str, 
@@ -82,29 +110,53 @@ class EmbeddingService:
         Returns:
             Tuple of (similar_words, in_vocabulary, error_message)
         """
-        word = word.lower().strip()
+        return self._similar_words_word2vec(self._normalize(word), model_type, topn)
+    
+    def _similar_words_word2vec(
+        self,
+        word: str,
+        model_type: str,
+        topn: int
+    ) -> Tuple[List[Tuple[str, float]], bool, Optional[str]]:
+        """Word2Vec similarity for an already-normalized word."""
+        if model_type not in ("word2vec_cbow", "word2vec_skipgram"):
+            return [], False, f"Unknown model type: {model_type}"
         
         try:
-            if model_type == "word2vec_cbow":
-                model = self.loader.get_word2vec_cbow()
-            elif model_type == "word2vec_skipgram":
-                model = self.loader.get_word2vec_skipgram()
-            else:
-                return [], False, f"Unknown model type: {model_type}"
-            
-            if word not in model.wv:
-                return [], False, f"Word '{word}' not found in {model_type} vocabulary"
-            
-            # Get most similar words
-            similar = model.wv.most_similar(word, topn=topn)
-            results = [(w, float(score)) for w, score in similar]
-            
-            return results, True, None
+            results, in_vocab, message = self._similar_word2vec_cached(word, model_type, topn)
+            return list(results), in_vocab, message
             
         except Exception as e:
             logger.error(f"Error in Word2Vec similarity: {e}")
             return [], False, str(e)
     
+    def _lookup_similar_words_word2vec(
+        self,
+        word: str,
+        model_type: str,
+        topn: int
+    ) -> Tuple[Tuple[Tuple[str, float], ...], bool, Optional[str]]:
+        """Uncached Word2Vec similarity lookup returning hashable results."""
+        if model_type == "word2vec_cbow":
+            model = self.loader.get_word2vec_cbow()
+        else:
+            model = self.loader.get_word2vec_skipgram()
+        
+        word_idx = model.wv.key_to_index.get(word)
+        if word_idx is None:
+            return (), False, f"Word '{word}' not found in {model_type} vocabulary"
+        
+        # Same GEMV + top-N kernel as TF-IDF over the pre-normalized vectors; gensim's
+        # most_similar would divide the whole score vector by the norms on every call
+        normed = self.loader.get_normed_embeddings(model_type)
+        top_indices, top_scores = topk_cosine(normed, normed[word_idx], topn, word_idx)
+        index_to_key = model.wv.index_to_key
+        
+        return tuple(
+            (index_to_key[idx], score)
+            for idx, score in zip(top_indices.tolist(), top_scores.tolist())
+        ), True, None
+    
     def get_similar_words(
         self, 
         word: str, 
@@ -122,57 +174,138 @@ class EmbeddingService:
         Returns:
             Tuple of (similar_words, in_vocabulary, error_message)
         """
+        word = self._normalize(word)
+        
         if model_type == "tfidf":
-            return self.get_similar_words_tfidf(word, topn)
+            return self._similar_words_tfidf(word, topn)
         elif model_type in ["word2vec_cbow", "word2vec_skipgram"]:
-            return self.get_similar_words_word2vec(word, model_type, topn)
+            return self._similar_words_word2vec(word, model_type, topn)
         else:
             return [], False, f"Unknown model type: {model_type}"
     
-    def get_word_vector(
-        self, 
-        word: str, 
-        model_type: str = "tfidf"
-    ) -> Optional[np.ndarray]:
+    def _get_index_to_key(self, model_type: str):
+        """Get the row-index-to-word mapping for a model."""
+        if model_type == "tfidf":
+            return self.loader.get_tfidf_idx_to_word()
+        elif model_type == "word2vec_cbow":
+            return self.loader.get_word2vec_cbow().wv.index_to_key
+        elif model_type == "word2vec_skipgram":
+            return self.loader.get_word2vec_skipgram().wv.index_to_key
+        return None
+    
+    def get_similar_words_batch(
+        self,
+        words: List[str],
+        model_type: str = "tfidf",
+        topn: int = 10
+    ) -> List[Tuple[List[Tuple[str, float]], bool, Optional[str]]]:
         """
-        Get the embedding vector for a word.
+        Get similar words for several query words with a single matrix multiply.
         
         Args:
-            word: The word to get vector for
-            model_type: Model type
+            words: Query words
+            model_type: "tfidf", "word2vec_cbow", or "word2vec_skipgram"
+            topn: Number of similar words to return per query
             
         Returns:
-            Numpy array of the word vector, or None if not found
+            List of (similar_words, in_vocabulary, error_message), one per query word
         """
-        word = word.lower().strip()
+        words = [self._normalize(w) for w in words]
         
         try:
-            if model_type == "tfidf":
-                vocab = self.loader.get_tfidf_vocab()
-                embeddings = self.loader.get_tfidf_embeddings()
-                
-                if word not in vocab:
-                    return None
-                
-                return embeddings[vocab[word]]
-                
-            elif model_type == "word2vec_cbow":
-                model = self.loader.get_word2vec_cbow()
-                if word not in model.wv:
-                    return None
-                return model.wv[word]
-                
-            elif model_type == "word2vec_skipgram":
-                model = self.loader.get_word2vec_skipgram()
-                if word not in model.wv:
-                    return None
-                return model.wv[word]
+            key_to_index, _ = self.get_embedding_matrix(model_type)
+            normed = self.loader.get_normed_embeddings(model_type)
+            if normed is None:
+                return [([], False, f"Unknown model type: {model_type}") for _ in words]
+            index_to_key = self._get_index_to_key(model_type)
+            vocab_label = "TF-IDF" if model_type == "tfidf" else model_type
+            
+            indices = [key_to_index.get(w, -1) for w in words]
+            found = [i for i in indices if i >= 0]
+            
+            results = []
+            if found:
+                # (B x D) @ (D x V) -> similarities for all queries at once
+                sims = normed[found] @ normed.T
+                k = min(topn + 1, sims.shape[1])
+                top = np.argpartition(sims, -k, axis=1)[:, -k:]
+            
+            row = 0
+            for word, word_idx in zip(words, indices):
+                if word_idx < 0:
+                    results.append(([], False, f"Word '{word}' not found in {vocab_label} vocabulary"))
+                    continue
                 
+                candidates = top[row]
+                candidates = candidates[np.argsort(sims[row, candidates])[::-1]]
+                similar = [
+                    (index_to_key[idx], float(sims[row, idx]))
+                    for idx in candidates
+                    if idx != word_idx
+                ][:topn]
+                results.append((similar, True, None))
+                row += 1
+            
+            return results
+            
         except Exception as e:
-            logger.error(f"Error getting word vector: {e}")
-            return None
+            logger.error(f"Error in batch similarity: {e}")
+            return [([], False, str(e)) for _ in words]
+    
+    def get_embedding_matrix(
+        self,
+        model_type: str = "tfidf"
+    ) -> Tuple[Dict[str, int], Optional[np.ndarray]]:
+        """
+        Get the full embedding matrix of a model with its word-to-row mapping.
         
-        return None
+        Args:
+            model_type: Model type
+            
+        Returns:
+            Tuple of (word-to-index mapping, embeddings matrix or None if unknown)
+        """
+        if model_type == "tfidf":
+            return self.loader.get_tfidf_vocab(), self.loader.get_tfidf_embeddings()
+        elif model_type == "word2vec_cbow":
+            model = self.loader.get_word2vec_cbow()
+            return model.wv.key_to_index, model.wv.vectors
+        elif model_type == "word2vec_skipgram":
+            model = self.loader.get_word2vec_skipgram()
+            return model.wv.key_to_index, model.wv.vectors
+        
+        return {}, None
+    
+    def get_word_vectors_batch(
+        self,
+        words: List[str],
+        model_type: str = "tfidf"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get embedding vectors for several words with a single matrix gather.
+        
+        Args:
+            words: Words to get vectors for
+            model_type: Model type
+            
+        Returns:
+            Tuple of (vectors for the words found, boolean mask over `words`
+            marking which were found)
+        """
+        words = [self._normalize(w) for w in words]
+        
+        try:
+            key_to_index, matrix = self.get_embedding_matrix(model_type)
+            if matrix is None:
+                return np.array([]), np.zeros(len(words), dtype=bool)
+            
+            indices = np.array([key_to_index.get(w, -1) for w in words], dtype=np.int64)
+            mask = indices >= 0
+            return matrix[indices[mask]], mask
+            
+        except Exception as e:
+            logger.error(f"Error getting word vectors: {e}")
+            return np.array([]), np.zeros(len(words), dtype=bool)
     
     def get_all_embeddings(
         self, 
@@ -187,43 +320,29 @@ class EmbeddingService:
             num_words: Number of words to include
             
         Returns:
-            Tuple of (embeddings matrix, list of words)
+            Tuple of (read-only embeddings matrix, list of words)
         """
-        frequencies = self.loader.get_word_frequencies()
+        embeddings, top_words = self._top_words_cached(model_type, num_words)
+        return embeddings, list(top_words)
+    
+    def _top_words_and_embeddings(
+        self,
+        model_type: str,
+        num_words: int
+    ) -> Tuple[np.ndarray, Tuple[str, ...]]:
+        """Uncached top-N gather; the matrix is frozen since callers share it."""
+        _, embeddings = self.get_embedding_matrix(model_type)
+        if embeddings is None:
+            return np.array([]), ()
         
-        if model_type == "tfidf":
-            vocab = self.loader.get_tfidf_vocab()
-            embeddings = self.loader.get_tfidf_embeddings()
-            
-            # Get top words by frequency
-            vocab_with_freq = [(w, frequencies.get(w, 0)) for w in vocab.keys()]
-            vocab_with_freq.sort(key=lambda x: x[1], reverse=True)
-            top_words = [w for w, _ in vocab_with_freq[:num_words]]
-            
-            # Get embeddings for these words
-            indices = [vocab[w] for w in top_words]
-            selected_embeddings = embeddings[indices]
-            
-            return selected_embeddings, top_words
-            
-        elif model_type in ["word2vec_cbow", "word2vec_skipgram"]:
-            if model_type == "word2vec_cbow":
-                model = self.loader.get_word2vec_cbow()
-            else:
-                model = self.loader.get_word2vec_skipgram()
-            
-            # Get top words by frequency that are in the model
-            all_words = list(model.wv.key_to_index.keys())
-            vocab_with_freq = [(w, frequencies.get(w, 0)) for w in all_words]
-            vocab_with_freq.sort(key=lambda x: x[1], reverse=True)
-            top_words = [w for w, _ in vocab_with_freq[:num_words]]
-            
-            # Get embeddings
-            selected_embeddings = np.array([model.wv[w] for w in top_words])
-            
-            return selected_embeddings, top_words
+        # Frequency order is cached at load time; slice it and gather rows in one go
+        top_words, _ = self.loader.get_top_n(model_type, num_words)
+        indices = self.loader.get_top_n_indices(model_type, num_words)
         
-        return np.array([]), []
+        # Compact float32 for PCA / t-SNE; a no-op for the float32 matrices the loader keeps
+        selected = np.ascontiguousarray(embeddings[indices], dtype=np.float32)
+        selected.flags.writeable = False
+        return selected, tuple(top_words)
     
     def compare_similarity(
         self, 
@@ -240,15 +359,39 @@ class EmbeddingService:
         Returns:
             Dictionary with results per model
         """
-        results = {}
+        return self.compare_similarity_batch([word], topn)[0]
+    
+    def compare_similarity_batch(
+        self,
+        words: List[str],
+        topn: int = 10
+    ) -> List[dict]:
+        """
+        Compare similarity results across all models for several words.
+        
+        Each model's matrix is multiplied once against all query words. A single
+        word goes through get_similar_words instead, so repeated lookups hit its cache.
+        
+        Args:
+            words: Query words
+            topn: Number of similar words per model
+            
+        Returns:
+            List of dictionaries with results per model, one per query word
+        """
+        results = [{} for _ in words]
         
         for model_type in ["tfidf", "word2vec_cbow", "word2vec_skipgram"]:
-            similar, in_vocab, message = self.get_similar_words(word, model_type, topn)
-            results[model_type] = {
-                "similar_words": [{"word": w, "similarity": s} for w, s in similar],
-                "in_vocabulary": in_vocab,
-                "message": message,
-            }
+            if len(words) == 1:
+                batch = [self.get_similar_words(words[0], model_type, topn)]
+            else:
+                batch = self.get_similar_words_batch(words, model_type, topn)
+            for result, (similar, in_vocab, message) in zip(results, batch):
+                result[model_type] = {
+                    "similar_words": [{"word": w, "similarity": s} for w, s in similar],
+                    "in_vocabulary": in_vocab,
+                    "message": message,
+                }
         
         return results
 
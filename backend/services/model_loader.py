@@ -1,8 +1,10 @@
 """
-Model loading service with lazy loading and caching.
+Model loading service with lazy loading, optional prewarming and caching.
 """
 import logging
-from typing import Optional, Dict, Any
+import os
+import threading
+from typing import Optional, Dict, Any, Callable, List, Sequence, Tuple
 from pathlib import Path
 
 import numpy as np
@@ -18,6 +20,8 @@ class ModelLoader:
     """
     Singleton service for loading and caching embedding models.
     Uses lazy loading to only load models when first accessed.
+    TF-IDF matrices are memory-mapped, so model files must not be moved
+    or replaced while the process is running.
     """
     
     _instance: Optional["ModelLoader"] = None
@@ -35,81 +39,191 @@ class ModelLoader:
         self._initialized = True
         self._models: Dict[str, Any] = {}
         self._tfidf_vocab: Optional[Dict[str, int]] = None
-        self._tfidf_idx_to_word: Optional[Dict[int, str]] = None
+        self._tfidf_idx_to_word: Optional[np.ndarray] = None  # object array of words by row
         self._tfidf_embeddings: Optional[np.ndarray] = None
         self._word_frequencies: Optional[Dict[str, int]] = None
+        self._sorted_vocab: Dict[str, Tuple[List[str], np.ndarray, np.ndarray]] = {}  # words, freqs, row indices
+        self._normed_embeddings: Dict[str, np.ndarray] = {}  # L2-normalized float32 matrices
+        # Guard first loads (double-checked) so concurrent first hits don't load twice;
+        # reentrant so a loader that triggers a nested load of the same resource can't deadlock
+        self._load_locks: Dict[str, threading.RLock] = {
+            key: threading.RLock()
+            for key in ["tfidf", "word2vec_cbow", "word2vec_skipgram", "word_frequencies", "sorted_vocab"]
+        }
         
         logger.info("ModelLoader initialized")
     
+    @staticmethod
+    def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+        """Return a float32, row-wise L2-normalized copy of a matrix."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.ascontiguousarray(matrix / np.where(norms == 0, 1, norms), dtype=np.float32)
+    
+    def _load_sidecar(
+        self,
+        sidecar_path: Path,
+        source_path: Path,
+        shape: Tuple[int, ...],
+        build: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Memory-map a float32 .npy derived from a model file, writing it on first run.
+        
+        Args:
+            sidecar_path: Sidecar .npy file
+            source_path: Model file the sidecar is derived from
+            shape: Expected matrix shape
+            build: Computes the float32 matrix if the sidecar is missing or stale
+            
+        Returns:
+            Float32 matrix, memory-mapped unless the sidecar could not be written
+        """
+        if sidecar_path.exists() and sidecar_path.stat().st_mtime >= source_path.stat().st_mtime:
+            try:
+                matrix = np.load(str(sidecar_path), mmap_mode="r")
+                if matrix.shape == shape and matrix.dtype == np.float32:
+                    return matrix
+            except (ValueError, OSError) as e:
+                logger.warning(f"Unreadable {sidecar_path}, regenerating: {e}")
+        
+        matrix = build()
+        # Write then rename so a crash or a concurrent worker never sees a partial file
+        tmp_path = sidecar_path.with_name(f".{sidecar_path.name}.{os.getpid()}.tmp")
+        try:
+            logger.info(f"Writing {sidecar_path}")
+            with open(tmp_path, "wb") as f:
+                np.save(f, matrix)
+            tmp_path.replace(sidecar_path)
+        except OSError as e:
+            logger.warning(f"Could not write {sidecar_path}, keeping the matrix in memory: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return matrix
+        return np.load(str(sidecar_path), mmap_mode="r")
+    
+    def _load_normed(self, normed_path: Path, source_path: Path, matrix: np.ndarray) -> np.ndarray:
+        """Memory-map the L2-normalized sidecar of an embeddings matrix."""
+        return self._load_sidecar(normed_path, source_path, matrix.shape, lambda: self._l2_normalize(matrix))
+    
     def _load_tfidf_models(self) -> None:
         """Load TF-IDF related models and embeddings."""
-        if self._tfidf_embeddings is not None:
+        if self._tfidf_idx_to_word is not None:
             return
         
-        logger.info("Loading TF-IDF models...")
-        
-        # Load word embeddings (LSA reduced)
-        embeddings_path = MODEL_PATHS["tfidf_word_embeddings"]
-        if embeddings_path.exists():
-            self._tfidf_embeddings = np.load(str(embeddings_path))
-            logger.info(f"Loaded TF-IDF embeddings: {self._tfidf_embeddings.shape}")
-        else:
-            raise FileNotFoundError(f"TF-IDF embeddings not found: {embeddings_path}")
-        
-        # Load vocabulary mapping
-        vocab_path = MODEL_PATHS["tfidf_vocab"]
-        if vocab_path.exists():
-            self._tfidf_vocab = joblib.load(str(vocab_path))
-            self._tfidf_idx_to_word = {idx: word for word, idx in self._tfidf_vocab.items()}
-            logger.info(f"Loaded TF-IDF vocabulary: {len(self._tfidf_vocab)} words")
-        else:
-            raise FileNotFoundError(f"TF-IDF vocabulary not found: {vocab_path}")
-    
+        with self._load_locks["tfidf"]:
+            if self._tfidf_idx_to_word is not None:
+                return
+            
+            logger.info("Loading TF-IDF models...")
+            
+            # Load word embeddings (LSA reduced)
+            embeddings_path = MODEL_PATHS["tfidf_word_embeddings"]
+            if embeddings_path.exists():
+                # Memory-map so only the rows actually used are paged in
+                embeddings = np.load(str(embeddings_path), mmap_mode="r")
+                if embeddings.dtype != np.float32 or not embeddings.flags.c_contiguous:
+                    # Cast once into a float32 sidecar and map that instead of reading it into RAM
+                    raw = embeddings
+                    embeddings = self._load_sidecar(
+                        MODEL_PATHS["tfidf_word_embeddings_f32"], embeddings_path, raw.shape,
+                        lambda: np.ascontiguousarray(raw, dtype=np.float32)
+                    )
+                self._tfidf_embeddings = embeddings
+                self._normed_embeddings["tfidf"] = self._load_normed(
+                    MODEL_PATHS["tfidf_word_embeddings_normed"], embeddings_path, self._tfidf_embeddings
+                )
+                logger.info(
+                    f"Loaded TF-IDF embeddings: {self._tfidf_embeddings.shape} "
+                    f"({self._tfidf_embeddings.nbytes / 1e6:.1f} MB float32)"
+                )
+            else:
+                raise FileNotFoundError(f"TF-IDF embeddings not found: {embeddings_path}")
+            
+            # Load vocabulary mapping
+            vocab_path = MODEL_PATHS["tfidf_vocab"]
+            if vocab_path.exists():
+                self._tfidf_vocab = joblib.load(str(vocab_path))
+                idx_to_word = [None] * len(self._tfidf_vocab)
+                for word, idx in self._tfidf_vocab.items():
+                    idx_to_word[idx] = word
+                self._tfidf_idx_to_word = np.array(idx_to_word, dtype=object)
+                logger.info(f"Loaded TF-IDF vocabulary: {len(self._tfidf_vocab)} words")
+            else:
+                raise FileNotFoundError(f"TF-IDF vocabulary not found: {vocab_path}")
+            
     def _load_word2vec_model(self, model_type: str) -> Word2Vec:
         """Load a Word2Vec model (CBOW or Skip-Gram)."""
         if model_type in self._models:
             return self._models[model_type]
         
-        logger.info(f"Loading {model_type} model...")
-        
-        model_path = MODEL_PATHS[model_type]
-        if model_path.exists():
-            model = Word2Vec.load(str(model_path))
-            self._models[model_type] = model
-            logger.info(f"Loaded {model_type}: {len(model.wv)} words, {model.wv.vector_size} dimensions")
-            return model
-        else:
-            raise FileNotFoundError(f"Word2Vec model not found: {model_path}")
-    
+        with self._load_locks[model_type]:
+            if model_type in self._models:
+                return self._models[model_type]
+            
+            logger.info(f"Loading {model_type} model...")
+            
+            model_path = MODEL_PATHS[model_type]
+            if model_path.exists():
+                model = Word2Vec.load(str(model_path))
+                if model.wv.vectors.dtype != np.float32:
+                    model.wv.vectors = model.wv.vectors.astype(np.float32)
+                # Precompute norms so the first most_similar() call doesn't pay for them
+                model.wv.fill_norms()
+                logger.info(f"Precomputed {model_type} vector norms: {model.wv.norms.shape}")
+                self._normed_embeddings[model_type] = self._load_normed(
+                    MODEL_PATHS[f"{model_type}_normed"], model_path, model.wv.vectors
+                )
+                self._models[model_type] = model
+                logger.info(f"Loaded {model_type}: {len(model.wv)} words, {model.wv.vector_size} dimensions")
+                return model
+            else:
+                raise FileNotFoundError(f"Word2Vec model not found: {model_path}")
+            
     def _load_word_frequencies(self) -> Dict[str, int]:
         """Load word frequency counts."""
         if self._word_frequencies is not None:
             return self._word_frequencies
         
-        freq_path = MODEL_PATHS["word_frequencies"]
-        if freq_path.exists():
-            self._word_frequencies = joblib.load(str(freq_path))
-            logger.info(f"Loaded word frequencies: {len(self._word_frequencies)} words")
-            return self._word_frequencies
-        else:
-            logger.warning(f"Word frequencies not found: {freq_path}")
-            return {}
-    
+        with self._load_locks["word_frequencies"]:
+            if self._word_frequencies is not None:
+                return self._word_frequencies
+            
+            freq_path = MODEL_PATHS["word_frequencies"]
+            if freq_path.exists():
+                self._word_frequencies = joblib.load(str(freq_path))
+                logger.info(f"Loaded word frequencies: {len(self._word_frequencies)} words")
+                return self._word_frequencies
+            else:
+                logger.warning(f"Word frequencies not found: {freq_path}")
+                return {}
+            
     def get_tfidf_embeddings(self) -> np.ndarray:
         """Get TF-IDF word embeddings matrix."""
         self._load_tfidf_models()
         return self._tfidf_embeddings
     
+    def get_tfidf_embeddings_normalized(self) -> np.ndarray:
+        """Get L2-normalized float32 TF-IDF word embeddings matrix."""
+        self._load_tfidf_models()
+        return self._normed_embeddings["tfidf"]
+    
     def get_tfidf_vocab(self) -> Dict[str, int]:
         """Get TF-IDF word-to-index vocabulary."""
         self._load_tfidf_models()
         return self._tfidf_vocab
     
-    def get_tfidf_idx_to_word(self) -> Dict[int, str]:
+    def get_tfidf_idx_to_word(self) -> Sequence[str]:
         """Get TF-IDF index-to-word mapping."""
         self._load_tfidf_models()
         return self._tfidf_idx_to_word
     
+    def get_normed_embeddings(self, model_type: str) -> Optional[np.ndarray]:
+        """Get the L2-normalized embedding matrix for a model."""
+        if model_type == "tfidf":
+            self._load_tfidf_models()
+        elif model_type in ["word2vec_cbow", "word2vec_skipgram"]:
+            self._load_word2vec_model(model_type)
+        return self._normed_embeddings.get(model_type)
+    
     def get_word2vec_cbow(self) -> Word2Vec:
         """Get Word2Vec CBOW model."""
         return self._load_word2vec_model("word2vec_cbow")
@@ -122,6 +236,47 @@ class ModelLoader:
         """Get word frequency counts."""
         return self._load_word_frequencies()
     
+    def _build_sorted_vocab(self, model_type: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Sort a model's vocabulary by corpus frequency (descending), with embedding row indices."""
+        if model_type in self._sorted_vocab:
+            return self._sorted_vocab[model_type]
+        
+        with self._load_locks["sorted_vocab"]:
+            if model_type in self._sorted_vocab:
+                return self._sorted_vocab[model_type]
+            
+            if model_type == "tfidf":
+                index_to_key = self.get_tfidf_idx_to_word()
+            elif model_type in ["word2vec_cbow", "word2vec_skipgram"]:
+                index_to_key = self._load_word2vec_model(model_type).wv.index_to_key
+            else:
+                empty = np.array([], dtype=np.int32)
+                return [], empty, empty
+            
+            # Dense frequency array aligned with embedding rows, so the order doubles as row indices
+            frequencies = self.get_word_frequencies()
+            freqs = np.fromiter(
+                (frequencies.get(w, 0) for w in index_to_key),
+                dtype=np.int32,
+                count=len(index_to_key),
+            )
+            rows = np.argsort(-freqs, kind="stable")
+            
+            sorted_vocab = ([index_to_key[i] for i in rows], freqs[rows], rows)
+            self._sorted_vocab[model_type] = sorted_vocab
+            logger.info(f"Cached frequency order for {model_type}: {len(index_to_key)} words")
+            return sorted_vocab
+    
+    def get_top_n(self, model_type: str, n: int) -> Tuple[List[str], np.ndarray]:
+        """Get the N most frequent words of a model and their frequencies."""
+        words, freqs, _ = self._build_sorted_vocab(model_type)
+        return words[:n], freqs[:n]
+    
+    def get_top_n_indices(self, model_type: str, n: int) -> np.ndarray:
+        """Get the embedding row indices of the N most frequent words of a model."""
+        _, _, rows = self._build_sorted_vocab(model_type)
+        return rows[:n]
+    
     def get_model_info(self, model_type: str) -> Dict[str, Any]:
         """Get information about a specific model."""
         try:
@@ -181,26 +336,43 @@ class ModelLoader:
         
         return False
     
-    def get_vocabulary_sample(self, model_type: str, n: int = 50) -> list:
-        """Get a sample of words from the vocabulary."""
-        frequencies = self.get_word_frequencies()
+    def prewarm(self, async_: bool = True) -> Optional[threading.Thread]:
+        """
+        Load all models ahead of the first request.
         
-        if model_type == "tfidf":
-            self._load_tfidf_models()
-            vocab = list(self._tfidf_vocab.keys())
-        elif model_type in ["word2vec_cbow", "word2vec_skipgram"]:
-            model = self._load_word2vec_model(model_type)
-            vocab = list(model.wv.key_to_index.keys())
-        else:
-            return []
+        Args:
+            async_: Load in a background daemon thread instead of blocking
+            
+        Returns:
+            The loader thread when async_ is True, otherwise None
+        """
+        def _load_all():
+            loaders = [
+                ("tfidf", self._load_tfidf_models),
+                ("word2vec_cbow", lambda: self._load_word2vec_model("word2vec_cbow")),
+                ("word2vec_skipgram", lambda: self._load_word2vec_model("word2vec_skipgram")),
+                ("word_frequencies", self._load_word_frequencies),
+            ]
+            for name, load in loaders:
+                try:
+                    load()
+                except Exception as e:
+                    logger.error(f"Prewarm failed for {name}: {e}")
+            logger.info("Model prewarm complete")
         
-        # Sort by frequency if available, otherwise return first N
-        if frequencies:
-            vocab_with_freq = [(w, frequencies.get(w, 0)) for w in vocab]
-            vocab_with_freq.sort(key=lambda x: x[1], reverse=True)
-            return [w for w, _ in vocab_with_freq[:n]]
+        if not async_:
+            _load_all()
+            return None
         
-        return vocab[:n]
+        thread = threading.Thread(target=_load_all, name="model-prewarm", daemon=True)
+        thread.start()
+        return thread
+    
+    def get_vocabulary_sample(self, model_type: str, n: int = 50) -> list:
+        """Get a sample of words from the vocabulary, most frequent first."""
+        # Slices the cached frequency order; without frequencies this is vocabulary order
+        words, _ = self.get_top_n(model_type, n)
+        return words
 
 
 # Global instance
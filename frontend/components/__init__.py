@@ -12,11 +12,17 @@ from .similarity_panel import (
     render_word_chips
 )
 from .styles import (
+    FONT_LINKS,
     GLOBAL_STYLES,
+    global_styles,
     ICONS,
     render_loading,
     render_empty_state,
     render_badge,
     render_page_header,
-    get_score_color
+    get_score_color,
+    get_score_colors,
+    minify_css,
+    minify_html,
+    svg_icon
 )
@@ -1,62 +1,102 @@
 """
 Sidebar component for model selection and parameters.
 """
+from types import MappingProxyType
+from typing import Optional, Sequence
+
 import streamlit as st
 from frontend.utils.api_client import get_api_client
-from frontend.components.styles import GLOBAL_STYLES, ICONS
+from frontend.components.styles import minify_html, svg_icon
+
+_MODEL_OPTIONS = MappingProxyType({
+    "tfidf": "TF-IDF (LSA)",
+    "word2vec_cbow": "Word2Vec CBOW",
+    "word2vec_skipgram": "Word2Vec Skip-Gram"
+})
+
+# HTML templates; the sidebar's icons never change, so its headers are filled once at import
+_SIDEBAR_HEADER_TMPL = minify_html("""
+<div class="row-flex" style="gap: 0.75rem; margin-bottom: 1.5rem; padding-bottom: 1rem; border-bottom: 1px solid var(--border);">
+    <div style="color: var(--primary);">{settings_icon}</div>
+    <span class="text-primary-600" style="font-size: 1.1rem;">Settings</span>
+</div>
+""")
+
+_SECTION_HEADER_TMPL = minify_html("""
+<div class="row-flex"{row_style}>
+    <div class="row-icon" style="color: {color};">{icon}</div>
+    <span class="label-section">{label}</span>
+</div>
+""")
+
+_SIDEBAR_HEADER_HTML = _SIDEBAR_HEADER_TMPL.format_map({"settings_icon": svg_icon('settings')})
+_MODEL_SECTION_HTML = _SECTION_HEADER_TMPL.format_map(
+    {"row_style": "", "color": "var(--accent)", "icon": svg_icon('layers'), "label": "Model Selection"}
+)
+_VISUALIZATION_SECTION_HTML = _SECTION_HEADER_TMPL.format_map(
+    {"row_style": "", "color": "var(--secondary)", "icon": svg_icon('chart'), "label": "Visualization"}
+)
+_MODEL_INFO_SECTION_HTML = _SECTION_HEADER_TMPL.format_map(
+    {"row_style": ' style="margin-bottom: 0.75rem;"', "color": "var(--warning)", "icon": svg_icon('info'), "label": "Model Info"}
+)
+
+# Contiguous HTML between widgets is joined so each block goes out in one st.markdown call
+_SIDEBAR_TOP_HTML = _SIDEBAR_HEADER_HTML + _MODEL_SECTION_HTML
+_VISUALIZATION_BLOCK_HTML = "<div style='height: 1rem;'></div>" + _VISUALIZATION_SECTION_HTML
+_MODEL_INFO_BLOCK_HTML = "<hr style='margin: 1.5rem 0;'>" + _MODEL_INFO_SECTION_HTML
 
+_MODEL_LOADED_HTML = minify_html("""
+<div class="badge badge-success" style="margin-top: 0.5rem;">
+    {check_icon}
+    Model loaded
+</div>
+""").format_map({"check_icon": svg_icon("check", 14)})
 
-def render_sidebar():
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_model_info(model_type: str) -> dict:
+    """Fetch model info once per model every 5 minutes instead of on every rerun."""
+    return get_api_client().get_model_info(model_type)
+
+
+def render_sidebar(rerun_on: Optional[Sequence[str]] = None) -> dict:
     """
     Render the sidebar with model selection and parameters.
     
+    The sidebar runs as a fragment, so moving its widgets only reruns the
+    sidebar. The full page reruns only when a parameter it consumes changes.
+    Pages inject global_styles() themselves before calling this.
+    
+    Args:
+        rerun_on: Parameter names the calling page depends on; None means all
+    
     Returns:
         dict: Selected parameters
     """
-    # Apply global styles
-    st.markdown(GLOBAL_STYLES, unsafe_allow_html=True)
-    
-    # Sidebar header
-    st.sidebar.markdown(f"""
-    <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 1.5rem; padding-bottom: 1rem; border-bottom: 1px solid var(--border);">
-        <div style="color: var(--primary);">{ICONS['settings']}</div>
-        <span style="color: var(--text-primary); font-weight: 600; font-size: 1.1rem;">Settings</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Model selection
-    st.sidebar.markdown(f"""
-    <div style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.5rem;">
-        <div style="color: var(--accent); width: 18px;">{ICONS['layers']}</div>
-        <span style="color: var(--text-secondary); font-weight: 500; font-size: 0.85rem;">Model Selection</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    model_options = {
-        "tfidf": "TF-IDF (LSA)",
-        "word2vec_cbow": "Word2Vec CBOW",
-        "word2vec_skipgram": "Word2Vec Skip-Gram"
-    }
+    with st.sidebar:
+        _sidebar_fragment(tuple(rerun_on) if rerun_on is not None else None)
     
-    selected_model = st.sidebar.selectbox(
+    return st.session_state["sidebar_params"]
+
+
+@st.fragment
+def _sidebar_fragment(rerun_on: Optional[tuple]):
+    """Sidebar widgets; stores the selection in st.session_state["sidebar_params"]."""
+    # Sidebar header and model selection label
+    st.markdown(_SIDEBAR_TOP_HTML, unsafe_allow_html=True)
+    
+    selected_model = st.selectbox(
         "Embedding Model",
-        options=list(model_options.keys()),
-        format_func=lambda x: model_options[x],
+        options=list(_MODEL_OPTIONS.keys()),
+        format_func=_MODEL_OPTIONS.__getitem__,
         key="model_selection",
         label_visibility="collapsed"
     )
     
-    st.sidebar.markdown("<div style='height: 1rem;'></div>", unsafe_allow_html=True)
-    
     # Visualization settings
-    st.sidebar.markdown(f"""
-    <div style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.5rem;">
-        <div style="color: var(--secondary); width: 18px;">{ICONS['chart']}</div>
-        <span style="color: var(--text-secondary); font-weight: 500; font-size: 0.85rem;">Visualization</span>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    reduction_method = st.sidebar.radio(
+    st.markdown(_VISUALIZATION_BLOCK_HTML, unsafe_allow_html=True)
+    
+    reduction_method = st.radio(
         "Reduction Method",
         options=["pca", "tsne"],
         format_func=lambda x: "PCA (Fast)" if x == "pca" else "t-SNE (Detailed)",
@@ -65,10 +105,10 @@ def render_sidebar():
         label_visibility="collapsed"
     )
     
-    st.sidebar.markdown("<div style='height: 0.5rem;'></div>", unsafe_allow_html=True)
+    st.markdown("<div style='height: 0.5rem;'></div>", unsafe_allow_html=True)
     
     # Initial word count (for progressive loading)
-    initial_words = st.sidebar.select_slider(
+    initial_words = st.select_slider(
         "Initial Points",
         options=[50, 100, 200, 300, 500],
         value=100,
@@ -77,7 +117,7 @@ def render_sidebar():
     )
     
     # Maximum words
-    max_words = st.sidebar.select_slider(
+    max_words = st.select_slider(
         "Maximum Points",
         options=[200, 500, 1000, 1500, 2000],
         value=500,
@@ -88,7 +128,7 @@ def render_sidebar():
     # t-SNE perplexity (only show if t-SNE selected)
     perplexity = 30
     if reduction_method == "tsne":
-        perplexity = st.sidebar.slider(
+        perplexity = st.slider(
             "t-SNE Perplexity",
             min_value=5,
             max_value=50,
@@ -97,37 +137,31 @@ def render_sidebar():
             help="Higher = more global structure"
         )
     
-    st.sidebar.markdown("<hr style='margin: 1.5rem 0;'>", unsafe_allow_html=True)
-    
     # Model info
-    st.sidebar.markdown(f"""
-    <div style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.75rem;">
-        <div style="color: var(--warning); width: 18px;">{ICONS['info']}</div>
-        <span style="color: var(--text-secondary); font-weight: 500; font-size: 0.85rem;">Model Info</span>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_MODEL_INFO_BLOCK_HTML, unsafe_allow_html=True)
     
-    api = get_api_client()
-    model_info = api.get_model_info(selected_model)
+    model_info = _cached_model_info(selected_model)
     
     if model_info:
-        col1, col2 = st.sidebar.columns(2)
+        col1, col2 = st.columns(2)
         with col1:
             st.metric("Vocabulary", f"{model_info.get('vocab_size', 0):,}")
         with col2:
             st.metric("Dimensions", model_info.get('vector_dimensions', 0))
         
         if model_info.get('is_loaded'):
-            st.sidebar.markdown("""
-            <div class="badge badge-success" style="margin-top: 0.5rem;">
-                <svg xmlns="http://www.w3.org/2000/svg" width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M20 6 9 17l-5-5"/></svg>
-                Model loaded
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_MODEL_LOADED_HTML, unsafe_allow_html=True)
     else:
-        st.sidebar.warning("Could not connect to backend")
+        # Don't keep a failed lookup cached; retry on the next rerun
+        _cached_model_info.clear()
+        st.warning("Could not connect to backend")
+    
+    if st.button("Clear cache", key="clear_cache", use_container_width=True, help="Refetch all data from the backend"):
+        # Pages and components import api_client under different module names, so clear all caches
+        st.cache_data.clear()
+        st.rerun()
     
-    return {
+    params = {
         "model_type": selected_model,
         "reduction_method": reduction_method,
         "initial_words": initial_words,
@@ -135,3 +169,12 @@ def render_sidebar():
         "num_words": initial_words,  # Start with initial
         "perplexity": perplexity
     }
+    
+    previous = st.session_state.get("sidebar_params")
+    st.session_state["sidebar_params"] = params
+    
+    # A fragment rerun leaves the page stale; rerun the app if the page reads a changed value
+    if previous is not None:
+        changed = {key for key in params if params[key] != previous.get(key)}
+        if changed and (rerun_on is None or changed.intersection(rerun_on)):
+            st.rerun()
@@ -2,8 +2,130 @@
 Similarity results panel component with polished styling.
 """
 import streamlit as st
-from typing import Dict, List
-from frontend.components.styles import ICONS, get_score_color
+from functools import lru_cache
+from html import escape
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+from frontend.components.styles import get_score_colors, minify_html, svg_icon
+
+# Model display names
+_MODEL_NAMES = MappingProxyType({
+    "tfidf": "TF-IDF (LSA)",
+    "word2vec_cbow": "Word2Vec CBOW",
+    "word2vec_skipgram": "Word2Vec Skip-Gram"
+})
+
+# Model display names and colors for the comparison columns
+_MODEL_CONFIG = MappingProxyType({
+    "tfidf": MappingProxyType({"name": "TF-IDF (LSA)", "color": "#6366f1"}),
+    "word2vec_cbow": MappingProxyType({"name": "Word2Vec CBOW", "color": "#06b6d4"}),
+    "word2vec_skipgram": MappingProxyType({"name": "Word2Vec Skip-Gram", "color": "#10b981"})
+})
+
+
+# HTML templates, parsed once at import and filled with str.format_map per render.
+# Minified so the cards go out as single lines with no blank line to split the HTML block.
+_EMPTY_STATE_HTML = minify_html("""
+<div class="empty-state">
+    <p>No results to display</p>
+</div>
+""")
+
+_RESULTS_HEADER_TMPL = minify_html("""
+<div class="results-card">
+    <div class="results-header">
+        <div class="row-between">
+            <div>
+                <span class="text-primary-600" style="font-size: 1.1rem;">
+                    Results for "{query_word}"
+                </span>
+                <div style="color: var(--text-muted); font-size: 0.85rem; margin-top: 0.25rem;">
+                    {model_name}
+                </div>
+            </div>
+            <div>
+                {badge}
+            </div>
+        </div>
+    </div>
+    <div class="results-body">
+""")
+
+_IN_VOCAB_BADGE_HTML = "<span class='badge badge-success'>" + svg_icon('check') + " In vocabulary</span>"
+_NOT_FOUND_BADGE_HTML = "<span class='badge badge-warning'>" + svg_icon('alert') + " Not found</span>"
+
+# Compact card for the not-in-vocabulary and no-results cases
+_COMPACT_EMPTY_TMPL = minify_html("""
+<div class="results-card">
+    <div class="results-header row-between">
+        <span class="text-primary-600">"{query_word}" &middot; {model_name}</span>
+        {badge}
+    </div>
+    <div class="results-body" style="text-align: center; color: var(--text-secondary);">{message}</div>
+</div>
+""")
+
+# Score bars; the slide-in keyframes live in GLOBAL_STYLES
+_SCORE_ROW_TMPL = (
+    '<div class="score-bar-container score-bar-animated" style="animation-delay: {delay}s;">'
+    '<span class="score-rank">{rank}.</span>'
+    '<span class="score-word">{word}</span>'
+    '<div class="score-bar"><div class="score-bar-fill" style="width: {width}%; '
+    'background: {color};"></div></div>'
+    '<span class="score-value">{score:.4f}</span>'
+    '</div>'
+)
+
+_RESULTS_FOOTER_HTML = "</div></div>"
+
+_COMPARISON_TITLE_TMPL = minify_html("""
+<div class="page-header" style="margin-bottom: 1.5rem;">
+    <div class="page-title">
+        <h2 style="margin: 0; font-size: 1.25rem;">Comparison for "{query_word}"</h2>
+    </div>
+</div>
+""")
+
+_CARD_HEADER_TMPL = minify_html("""
+<div class="card" style="border-top: 3px solid {color};">
+    <div class="row-flex" style="margin-bottom: 1rem;">
+        <div style="width: 8px; height: 8px; border-radius: 50%; background: {color};"></div>
+        <span class="text-primary-600">{name}</span>
+    </div>
+""")
+
+_CARD_MESSAGE_TMPL = minify_html("""
+<div class="card-message" style="color: var(--warning);">
+    <small>{message}</small>
+</div>
+""")
+
+_CARD_EMPTY_HTML = minify_html("""
+<div class="card-message" style="color: var(--text-muted);">
+    <small>No results</small>
+</div>
+""")
+
+_CARD_ROW_TMPL = (
+    '<div class="row-between compare-row">'
+    '<span class="compare-word">{rank}. {word}</span>'
+    '<span class="compare-score" style="color: {color};">{score:.3f}</span>'
+    '</div>'
+)
+
+
+def _compact_empty_card(query_word: str, model_type: str, in_vocab: bool, message: str = None) -> str:
+    """Return the single-line card shown when there are no results to list."""
+    if in_vocab:
+        badge, message = _IN_VOCAB_BADGE_HTML, 'No similar words found'
+    else:
+        badge, message = _NOT_FOUND_BADGE_HTML, message or 'Word not found in vocabulary'
+    return _COMPACT_EMPTY_TMPL.format_map({
+        "query_word": escape(query_word),
+        "model_name": _MODEL_NAMES.get(model_type, model_type),
+        "badge": badge,
+        "message": escape(message)
+    })
 
 
 def render_similarity_results(data: Dict, show_chart: bool = True):
@@ -15,11 +137,7 @@ def render_similarity_results(data: Dict, show_chart: bool = True):
         show_chart: Whether to show the bar chart
     """
     if not data:
-        st.markdown("""
-        <div class="empty-state">
-            <p>No results to display</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_EMPTY_STATE_HTML, unsafe_allow_html=True)
         return
     
     query_word = data.get("query_word", "")
@@ -28,82 +146,30 @@ def render_similarity_results(data: Dict, show_chart: bool = True):
     message = data.get("message")
     model_type = data.get("model_type", "unknown")
     
-    # Model display names
-    model_names = {
-        "tfidf": "TF-IDF (LSA)",
-        "word2vec_cbow": "Word2Vec CBOW",
-        "word2vec_skipgram": "Word2Vec Skip-Gram"
-    }
-    
-    # Results card
-    st.markdown(f"""
-    <div class="results-card">
-        <div class="results-header">
-            <div style="display: flex; justify-content: space-between; align-items: center;">
-                <div>
-                    <span style="color: var(--text-primary); font-weight: 600; font-size: 1.1rem;">
-                        Results for "{query_word}"
-                    </span>
-                    <div style="color: var(--text-muted); font-size: 0.85rem; margin-top: 0.25rem;">
-                        {model_names.get(model_type, model_type)}
-                    </div>
-                </div>
-                <div>
-                    {"<span class='badge badge-success'>" + ICONS['check'] + " In vocabulary</span>" if in_vocab else "<span class='badge badge-warning'>" + ICONS['alert'] + " Not found</span>"}
-                </div>
-            </div>
-        </div>
-        <div class="results-body">
-    """, unsafe_allow_html=True)
-    
-    if not in_vocab:
-        st.markdown(f"""
-            <div style="text-align: center; padding: 2rem; color: var(--text-secondary);">
-                <div style="color: var(--warning); margin-bottom: 0.5rem;">{ICONS['alert']}</div>
-                <p>{message or 'Word not found in vocabulary'}</p>
-            </div>
-        """, unsafe_allow_html=True)
-        st.markdown("</div></div>", unsafe_allow_html=True)
+    if not in_vocab or not similar_words:
+        st.markdown(_compact_empty_card(query_word, model_type, in_vocab, message), unsafe_allow_html=True)
         return
     
-    if not similar_words:
-        st.markdown("""
-            <div style="text-align: center; padding: 2rem; color: var(--text-secondary);">
-                <p>No similar words found</p>
-            </div>
-        """, unsafe_allow_html=True)
-        st.markdown("</div></div>", unsafe_allow_html=True)
-        return
-    
-    # Render score bars
-    for i, item in enumerate(similar_words, 1):
-        word = item["word"]
-        score = item["similarity"]
-        color = get_score_color(score)
-        width_pct = score * 100
-        
-        st.markdown(f"""
-        <div class="score-bar-container" style="animation: slideIn 0.3s ease forwards; animation-delay: {i * 0.05}s; opacity: 0;">
-            <span class="score-rank">{i}.</span>
-            <span class="score-word">{word}</span>
-            <div class="score-bar">
-                <div class="score-bar-fill" style="width: {width_pct}%; background: {color};"></div>
-            </div>
-            <span class="score-value">{score:.4f}</span>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("</div></div>", unsafe_allow_html=True)
-    
-    # Add animation keyframes
-    st.markdown("""
-    <style>
-        @keyframes slideIn {
-            from { opacity: 0; transform: translateX(-10px); }
-            to { opacity: 1; transform: translateX(0); }
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    # Results card, built as a single HTML string and emitted with one st.markdown call
+    header_html = _RESULTS_HEADER_TMPL.format_map({
+        "query_word": escape(query_word),
+        "model_name": _MODEL_NAMES.get(model_type, model_type),
+        "badge": _IN_VOCAB_BADGE_HTML
+    })
+    colors = get_score_colors([item["similarity"] for item in similar_words])
+    body_html = "".join(
+        _SCORE_ROW_TMPL.format_map({
+            "delay": i * 0.05,
+            "rank": i,
+            "word": item["word"],
+            "width": item["similarity"] * 100,
+            "color": color,
+            "score": item["similarity"]
+        })
+        for i, (item, color) in enumerate(zip(similar_words, colors), 1)
+    )
+    
+    st.markdown("".join((header_html, body_html, _RESULTS_FOOTER_HTML)), unsafe_allow_html=True)
 
 
 def render_comparison_results(data: Dict):
@@ -120,67 +186,49 @@ def render_comparison_results(data: Dict):
     query_word = data.get("query_word", "")
     results = data.get("results", {})
     
-    st.markdown(f"""
-    <div class="page-header" style="margin-bottom: 1.5rem;">
-        <div class="page-title">
-            <h2 style="margin: 0; font-size: 1.25rem;">Comparison for "{query_word}"</h2>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Model display names and colors
-    model_config = {
-        "tfidf": {"name": "TF-IDF (LSA)", "color": "#6366f1"},
-        "word2vec_cbow": {"name": "Word2Vec CBOW", "color": "#06b6d4"},
-        "word2vec_skipgram": {"name": "Word2Vec Skip-Gram", "color": "#10b981"}
-    }
+    st.markdown(_COMPARISON_TITLE_TMPL.format_map({"query_word": escape(query_word)}), unsafe_allow_html=True)
     
     # Create columns for each model
     cols = st.columns(3)
     
     for i, (model_type, model_results) in enumerate(results.items()):
-        config = model_config.get(model_type, {"name": model_type, "color": "#6366f1"})
+        config = _MODEL_CONFIG.get(model_type) or {"name": model_type, "color": "#6366f1"}
         
         with cols[i]:
             in_vocab = model_results.get("in_vocabulary", False)
             similar_words = model_results.get("similar_words", [])
             message = model_results.get("message")
             
-            # Card header
-            st.markdown(f"""
-            <div class="card" style="border-top: 3px solid {config['color']};">
-                <div style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 1rem;">
-                    <div style="width: 8px; height: 8px; border-radius: 50%; background: {config['color']};"></div>
-                    <span style="color: var(--text-primary); font-weight: 600;">{config['name']}</span>
-                </div>
-            """, unsafe_allow_html=True)
+            # Card header, body and closing tag go out in one st.markdown call
+            card_header = _CARD_HEADER_TMPL.format_map(config)
             
             if not in_vocab:
-                st.markdown(f"""
-                <div style="text-align: center; padding: 1rem; color: var(--warning);">
-                    <small>{message or 'Not in vocabulary'}</small>
-                </div>
-                """, unsafe_allow_html=True)
+                body = _CARD_MESSAGE_TMPL.format_map({"message": escape(message or 'Not in vocabulary')})
             elif not similar_words:
-                st.markdown("""
-                <div style="text-align: center; padding: 1rem; color: var(--text-muted);">
-                    <small>No results</small>
-                </div>
-                """, unsafe_allow_html=True)
+                body = _CARD_EMPTY_HTML
             else:
                 # Display words with scores
-                for j, item in enumerate(similar_words[:8], 1):
-                    score = item["similarity"]
-                    color = get_score_color(score)
-                    
-                    st.markdown(f"""
-                    <div style="display: flex; justify-content: space-between; align-items: center; padding: 0.5rem 0; border-bottom: 1px solid var(--border);">
-                        <span style="color: var(--text-primary); font-size: 0.9rem;">{j}. {item['word']}</span>
-                        <span style="color: {color}; font-size: 0.8rem; font-family: monospace;">{score:.3f}</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                shown = similar_words[:8]
+                colors = get_score_colors([item["similarity"] for item in shown])
+                body = "".join(
+                    _CARD_ROW_TMPL.format_map({
+                        "rank": j,
+                        "word": item["word"],
+                        "color": color,
+                        "score": item["similarity"]
+                    })
+                    for j, (item, color) in enumerate(zip(shown, colors), 1)
+                )
             
-            st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("".join((card_header, body, "</div>")), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=64)
+def _chips_html(words: Tuple[str, ...]) -> str:
+    """Build the chip row HTML once per distinct word list."""
+    return '<div style="margin: 0.5rem 0;">' + "".join(
+        f'<span class="word-chip">{word}</span>' for word in words
+    ) + '</div>'
 
 
 def render_word_chips(words: List[str], on_click_key: str = None):
@@ -194,13 +242,4 @@ def render_word_chips(words: List[str], on_click_key: str = None):
     if not words:
         return
     
-    # Create chip HTML
-    chips_html = ""
-    for word in words:
-        chips_html += f'<span class="word-chip">{word}</span>'
-    
-    st.markdown(f"""
-    <div style="margin: 0.5rem 0;">
-        {chips_html}
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_chips_html(tuple(words)), unsafe_allow_html=True)
@@ -1,13 +1,64 @@
 """
 Shared styles and theme configuration for the Embedding Explorer frontend.
 """
+import gzip
+import hashlib
+import os
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from types import MappingProxyType
+from typing import Sequence
 
-# CSS Styles for all pages
-GLOBAL_STYLES = """
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
+import numpy as np
+import streamlit as st
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+FONTS_DIR = STATIC_DIR / "fonts"
+
+# URL of frontend/static; relative so it also resolves under server.baseUrlPath
+STATIC_URL = "app/static"
+
+# Inter weights the stylesheets actually use
+FONT_WEIGHTS = (400, 500, 600, 700)
+
+
+def static_serving_enabled() -> bool:
+    """Whether Streamlit serves frontend/static (server.enableStaticServing)."""
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+# Self-host Inter when the WOFF2 files are present and Streamlit serves them
+HAS_LOCAL_FONTS = static_serving_enabled() and all(
+    (FONTS_DIR / f"inter-{weight}.woff2").is_file() for weight in FONT_WEIGHTS
+)
+
+if HAS_LOCAL_FONTS:
+    FONT_LINKS = "<style>" + "".join(
+        "@font-face{font-family:'Inter';font-style:normal;font-weight:%d;font-display:swap;"
+        "src:url('%s/fonts/inter-%d.woff2') format('woff2')}" % (weight, STATIC_URL, weight)
+        for weight in FONT_WEIGHTS
+    ) + "</style>"
+else:
+    # Google Fonts as <link> tags; unlike a CSS @import, the fetch doesn't hold up the stylesheet around it
+    FONT_LINKS = (
+        '<link rel="preconnect" href="https://fonts.googleapis.com">'
+        '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+        '<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@'
+        + ";".join(map(str, FONT_WEIGHTS)) + '&display=swap">'
+    )
+
+# CSS Styles for all pages. The critical part styles what the first view shows
+# (theme, page header, loaders) and is inlined on a session's first run.
+_CRITICAL_CSS = """
     /* Root variables */
     :root {
         --primary: #6366f1;
@@ -92,11 +143,68 @@ GLOBAL_STYLES = """
         margin: 0;
     }
     
-    /* Control panel */
-    .control-panel {
+    /* Shared card surface */
+    :is(.control-panel, .card, .results-card, .chart-container, .loading-overlay, [data-testid="stMetric"]) {
         background: var(--bg-card);
         border: 1px solid var(--border);
         border-radius: 12px;
+    }
+    
+    /* Loading state */
+    .loading-overlay {
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: center;
+        padding: 4rem 2rem;
+    }
+    
+    .loading-spinner {
+        width: 48px;
+        height: 48px;
+        border: 3px solid var(--border);
+        border-top-color: var(--primary);
+        border-radius: 50%;
+        animation: spin 1s linear infinite;
+        will-change: transform;
+    }
+    
+    @keyframes spin {
+        to { transform: rotate(360deg); }
+    }
+    
+    .loading-text {
+        margin-top: 1rem;
+        color: var(--text-secondary);
+        font-size: 0.9rem;
+    }
+    
+    .loading-progress {
+        width: 200px;
+        height: 4px;
+        background: var(--border);
+        border-radius: 2px;
+        margin-top: 1rem;
+        overflow: hidden;
+    }
+    
+    .loading-progress-bar {
+        height: 100%;
+        background: var(--gradient-1);
+        border-radius: 2px;
+        animation: progress-animation 2s ease-in-out infinite;
+    }
+    
+    @keyframes progress-animation {
+        0% { width: 0%; margin-left: 0%; }
+        50% { width: 60%; margin-left: 20%; }
+        100% { width: 0%; margin-left: 100%; }
+    }
+"""
+
+_DEFERRED_CSS = """
+    /* Control panel */
+    .control-panel {
         padding: 1.5rem;
         margin-bottom: 1.5rem;
     }
@@ -119,6 +227,7 @@ GLOBAL_STYLES = """
     
     /* Buttons */
     .stButton > button {
+        position: relative;
         background: var(--gradient-1);
         color: white;
         border: none;
@@ -126,13 +235,29 @@ GLOBAL_STYLES = """
         padding: 0.75rem 1.5rem;
         font-weight: 500;
         font-family: 'Inter', sans-serif;
-        transition: all 0.3s ease;
+        transition: transform 0.3s ease;
+        will-change: transform;
         box-shadow: 0 4px 14px -4px rgba(99, 102, 241, 0.4);
     }
     
+    /* Hover shadow is pre-rendered and faded in; animating opacity avoids repainting box-shadow */
+    .stButton > button::after {
+        content: "";
+        position: absolute;
+        inset: 0;
+        border-radius: inherit;
+        box-shadow: 0 8px 20px -4px rgba(99, 102, 241, 0.5);
+        opacity: 0;
+        transition: opacity 0.3s ease;
+        pointer-events: none;
+    }
+    
     .stButton > button:hover {
         transform: translateY(-2px);
-        box-shadow: 0 8px 20px -4px rgba(99, 102, 241, 0.5);
+    }
+    
+    .stButton > button:hover::after {
+        opacity: 1;
     }
     
     .stButton > button:active {
@@ -154,9 +279,6 @@ GLOBAL_STYLES = """
     
     /* Card style */
     .card {
-        background: var(--bg-card);
-        border: 1px solid var(--border);
-        border-radius: 12px;
         padding: 1.5rem;
         transition: all 0.3s ease;
     }
@@ -174,12 +296,15 @@ GLOBAL_STYLES = """
     
     /* Results card */
     .results-card {
-        background: var(--bg-card);
-        border: 1px solid var(--border);
-        border-radius: 12px;
         overflow: hidden;
     }
     
+    /* Skip layout and paint for result cards until they scroll into view */
+    .results-card, .card {
+        content-visibility: auto;
+        contain-intrinsic-size: auto 400px;
+    }
+    
     .results-header {
         background: var(--bg-hover);
         padding: 1rem 1.5rem;
@@ -221,59 +346,6 @@ GLOBAL_STYLES = """
         color: #6366f1;
     }
     
-    /* Loading state */
-    .loading-overlay {
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        padding: 4rem 2rem;
-        background: var(--bg-card);
-        border-radius: 12px;
-        border: 1px solid var(--border);
-    }
-    
-    .loading-spinner {
-        width: 48px;
-        height: 48px;
-        border: 3px solid var(--border);
-        border-top-color: var(--primary);
-        border-radius: 50%;
-        animation: spin 1s linear infinite;
-    }
-    
-    @keyframes spin {
-        to { transform: rotate(360deg); }
-    }
-    
-    .loading-text {
-        margin-top: 1rem;
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-    }
-    
-    .loading-progress {
-        width: 200px;
-        height: 4px;
-        background: var(--border);
-        border-radius: 2px;
-        margin-top: 1rem;
-        overflow: hidden;
-    }
-    
-    .loading-progress-bar {
-        height: 100%;
-        background: var(--gradient-1);
-        border-radius: 2px;
-        animation: progress-animation 2s ease-in-out infinite;
-    }
-    
-    @keyframes progress-animation {
-        0% { width: 0%; margin-left: 0%; }
-        50% { width: 60%; margin-left: 20%; }
-        100% { width: 0%; margin-left: 100%; }
-    }
-    
     /* Empty state */
     .empty-state {
         text-align: center;
@@ -317,6 +389,12 @@ GLOBAL_STYLES = """
         border-bottom: 1px solid var(--border);
     }
     
+    /* Long top-k lists: rows below the fold are skipped until scrolled to; ~45px is one row */
+    .score-bar-container {
+        content-visibility: auto;
+        contain-intrinsic-size: auto 45px;
+    }
+    
     .score-bar-container:last-child {
         border-bottom: none;
     }
@@ -428,10 +506,7 @@ GLOBAL_STYLES = """
     
     /* Metrics */
     [data-testid="stMetric"] {
-        background: var(--bg-card);
         padding: 1rem;
-        border-radius: 12px;
-        border: 1px solid var(--border);
     }
     
     [data-testid="stMetricValue"] {
@@ -477,13 +552,68 @@ GLOBAL_STYLES = """
     
     /* Plotly chart container */
     .chart-container {
-        background: var(--bg-card);
-        border: 1px solid var(--border);
-        border-radius: 12px;
         padding: 1rem;
         margin: 1rem 0;
     }
     
+    /* Shared layout and text classes for the generated HTML */
+    .row-flex {
+        display: flex;
+        align-items: center;
+        gap: 0.5rem;
+        margin-bottom: 0.5rem;
+    }
+    
+    .row-between {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+    }
+    
+    .row-icon {
+        width: 18px;
+    }
+    
+    .text-primary-600 {
+        color: var(--text-primary);
+        font-weight: 600;
+    }
+    
+    .label-section {
+        color: var(--text-secondary);
+        font-weight: 500;
+        font-size: 0.85rem;
+    }
+    
+    .card-message {
+        text-align: center;
+        padding: 1rem;
+    }
+    
+    .compare-row {
+        padding: 0.5rem 0;
+        border-bottom: 1px solid var(--border);
+    }
+    
+    .compare-word {
+        color: var(--text-primary);
+        font-size: 0.9rem;
+    }
+    
+    .compare-score {
+        font-size: 0.8rem;
+        font-family: monospace;
+    }
+    
+    /* Sprite icons; <use> content inherits these strokes */
+    .icon {
+        fill: none;
+        stroke: currentColor;
+        stroke-width: 2;
+        stroke-linecap: round;
+        stroke-linejoin: round;
+    }
+    
     /* Animation keyframes */
     @keyframes fadeIn {
         from { opacity: 0; transform: translateY(10px); }
@@ -502,9 +632,33 @@ GLOBAL_STYLES = """
     .animate-slide-in {
         animation: slideIn 0.3s ease forwards;
     }
-</style>
+    
+    /* Staggered entry for similarity score rows */
+    @keyframes scoreSlideIn {
+        from { opacity: 0; transform: translateX(-10px); }
+        to { opacity: 1; transform: translateX(0); }
+    }
+    
+    .score-bar-animated {
+        animation: scoreSlideIn 0.3s ease forwards;
+        opacity: 0;
+    }
+    
+    /* Reduced motion: finish animations at once (entries still end visible) and stop the loaders */
+    @media (prefers-reduced-motion: reduce) {
+        .loading-spinner, .loading-progress-bar, .animate-fade-in, .animate-slide-in, .score-bar-animated {
+            animation-duration: 0.001ms !important;
+            animation-iteration-count: 1 !important;
+        }
+        
+        .card, .word-chip, .score-bar-fill, .stButton > button, .stButton > button::after {
+            transition-duration: 0s !important;
+        }
+    }
 """
 
+_GLOBAL_CSS = _CRITICAL_CSS + _DEFERRED_CSS
+
 # SVG Icons
 ICONS = {
     "chart": """<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><circle cx="12" cy="12" r="10"/><path d="M12 2a14.5 14.5 0 0 0 0 20 14.5 14.5 0 0 0 0-20"/><path d="M2 12h20"/></svg>""",
@@ -523,74 +677,270 @@ ICONS = {
 }
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+# Whitespace between tags, or between a tag and a {placeholder}
+_TAG_GAP_RE = re.compile(r"(?<=[>}])\s+(?=[<{])")
+
+
+@lru_cache(maxsize=128)
+def minify_html(html: str) -> str:
+    """Collapse whitespace in an HTML fragment to shrink the payload sent on each rerun."""
+    return _TAG_GAP_RE.sub("", _WHITESPACE_RE.sub(" ", html)).strip()
+
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_PUNCTUATION_RE = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and whitespace from a stylesheet."""
+    css = _WHITESPACE_RE.sub(" ", _CSS_COMMENT_RE.sub("", css))
+    return _CSS_PUNCTUATION_RE.sub(r"\1", css).replace(": ", ":").replace(";}", "}").strip()
+
+
+ICONS = {name: minify_html(svg) for name, svg in ICONS.items()}
+
+
+def stylesheet_link(path: Path) -> str:
+    """Return a <link> tag for a stylesheet under frontend/static, versioned by its content hash."""
+    return f'<link rel="stylesheet" href="{_static_url(path)}">'
+
+
+def _static_url(path: Path) -> str:
+    """URL of a file under frontend/static, versioned by its content hash so browsers can cache it."""
+    version = hashlib.sha1(path.read_bytes()).hexdigest()[:12]
+    return f"{STATIC_URL}/{path.relative_to(STATIC_DIR).as_posix()}?v={version}"
+
+
+def _write_static_file(path: Path, content: str) -> bool:
+    """
+    Write generated content under frontend/static for Streamlit to serve.
+    
+    Args:
+        path: Target file
+        content: File contents
+    
+    Returns:
+        True if the file holds the content and is served, False to inline it instead
+    """
+    if not static_serving_enabled():
+        return False
+    try:
+        if not path.is_file() or path.read_text(encoding="utf-8") != content:
+            # Write then rename so a concurrent reader never sees a partial file
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(path)
+        write_precompressed(path)
+        return True
+    except OSError:
+        return False
+
+
+def write_precompressed(path: Path) -> None:
+    """
+    Write .gz (and .br, with brotli installed) siblings of a static file.
+    
+    Streamlit compresses responses itself; the siblings are for a reverse proxy
+    in front of it (nginx gzip_static/brotli_static) to serve as-is. Siblings
+    newer than the file are left alone.
+    
+    Args:
+        path: File under frontend/static
+    """
+    variants = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if HAS_BROTLI:
+        variants.append((".br", lambda data: brotli.compress(data, quality=11)))
+    
+    mtime = path.stat().st_mtime
+    data = None
+    for suffix, compress in variants:
+        target = path.with_name(path.name + suffix)
+        if target.is_file() and target.stat().st_mtime >= mtime:
+            continue
+        if data is None:
+            data = path.read_bytes()
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(compress(data))
+        tmp_path.replace(target)
+
+
+def _global_stylesheet(css: str) -> str:
+    """
+    Return the tag that applies the global stylesheet.
+    
+    The CSS is written to frontend/static/global.css so that each rerun sends a
+    short link tag the browser caches, not the whole stylesheet. Falls back to an
+    inline <style> block when static serving is off or the file can't be written.
+    
+    Args:
+        css: Minified stylesheet
+    
+    Returns:
+        HTML for st.markdown
+    """
+    path = STATIC_DIR / "global.css"
+    if _write_static_file(path, css):
+        return stylesheet_link(path)
+    return f"<style>{css}</style>"
+
+
+# Icon sprite: every icon as a <symbol>, served as one browser-cached file
+_SVG_OUTER_RE = re.compile(r"^<svg[^>]*>|</svg>$")
+ICON_SPRITE = '<svg xmlns="http://www.w3.org/2000/svg">' + "".join(
+    f'<symbol id="icon-{name}" viewBox="0 0 24 24">{_SVG_OUTER_RE.sub("", svg)}</symbol>'
+    for name, svg in ICONS.items()
+) + "</svg>"
+
+_ICON_SPRITE_PATH = STATIC_DIR / "icons.svg"
+_ICON_SPRITE_URL = _static_url(_ICON_SPRITE_PATH) if _write_static_file(_ICON_SPRITE_PATH, ICON_SPRITE) else None
+
+
+@lru_cache(maxsize=128)
+def svg_icon(name: str, size: int = 24) -> str:
+    """
+    Return HTML for an icon.
+    
+    References the cached sprite file when it is served, so each use costs a
+    short <use> tag; otherwise returns the full inline SVG.
+    
+    Args:
+        name: Key in ICONS
+        size: Width and height in pixels
+    
+    Returns:
+        SVG markup
+    """
+    if _ICON_SPRITE_URL is None:
+        return ICONS[name].replace('width="24" height="24"', f'width="{size}" height="{size}"', 1)
+    return f'<svg class="icon" width="{size}" height="{size}"><use href="{_ICON_SPRITE_URL}#icon-{name}"/></svg>'
+
+
+# Built once at import; pages re-send it on every rerun
+GLOBAL_STYLES = FONT_LINKS + _global_stylesheet(minify_css(_GLOBAL_CSS))
+
+# Inlined next to the link until global.css is in the browser cache; None when GLOBAL_STYLES is inline anyway
+_CRITICAL_STYLE = None if GLOBAL_STYLES.endswith("</style>") else f"<style>{minify_css(_CRITICAL_CSS)}</style>"
+
+
+def global_styles() -> str:
+    """
+    Return the HTML that applies the global styles, for st.markdown.
+    
+    On a session's first run the critical rules are inlined after the
+    stylesheet link, so the header and loaders are styled without waiting
+    for global.css. Later runs send the link alone; the full sheet repeats
+    the critical rules, and keeping the link first lets the browser keep
+    the element it already loaded.
+    
+    Returns:
+        GLOBAL_STYLES, plus the inline critical rules on the first run
+    """
+    if _CRITICAL_STYLE is None or st.session_state.get("_critical_css_sent"):
+        return GLOBAL_STYLES
+    st.session_state["_critical_css_sent"] = True
+    return GLOBAL_STYLES + _CRITICAL_STYLE
+
+
+# Templates for the render_* helpers, minified once at import
+_LOADING_TMPL = minify_html("""
+<div class="loading-overlay">
+    <div class="loading-spinner"></div>
+    <p class="loading-text">{message}</p>
+    {progress}
+</div>
+""")
+
+_LOADING_PROGRESS_HTML = minify_html("""
+<div class="loading-progress">
+    <div class="loading-progress-bar"></div>
+</div>
+""")
+
+_EMPTY_STATE_TMPL = minify_html("""
+<div class="empty-state">
+    <div class="empty-state-icon" style="color: var(--text-muted);">
+        {icon}
+    </div>
+    <p>{message}</p>
+</div>
+""")
+
+_BADGE_TMPL = '<span class="badge badge-{variant}">{icon} {text}</span>'
+
+_BADGE_ICONS = MappingProxyType({
+    "success": svg_icon("check"),
+    "warning": svg_icon("alert"),
+    "error": svg_icon("alert"),
+    "info": svg_icon("info")
+})
+
+_PAGE_HEADER_TMPL = minify_html("""
+<div class="page-header">
+    <div class="page-title">
+        {icon_html}
+        <h1>{title}</h1>
+    </div>
+    <p class="page-subtitle">{subtitle}</p>
+</div>
+""")
+
+
+@lru_cache(maxsize=256)
 def render_loading(message: str = "Loading...", show_progress: bool = True) -> str:
     """Return HTML for a loading indicator."""
-    progress_html = """
-        <div class="loading-progress">
-            <div class="loading-progress-bar"></div>
-        </div>
-    """ if show_progress else ""
-    
-    return f"""
-    <div class="loading-overlay">
-        <div class="loading-spinner"></div>
-        <p class="loading-text">{message}</p>
-        {progress_html}
-    </div>
-    """
+    return _LOADING_TMPL.format_map({
+        "message": escape(message),
+        "progress": _LOADING_PROGRESS_HTML if show_progress else ""
+    })
 
 
+@lru_cache(maxsize=256)
 def render_empty_state(message: str = "No data available", icon: str = "info") -> str:
     """Return HTML for an empty state."""
-    return f"""
-    <div class="empty-state">
-        <div class="empty-state-icon" style="color: var(--text-muted);">
-            {ICONS.get(icon, ICONS['info'])}
-        </div>
-        <p>{message}</p>
-    </div>
-    """
+    return _EMPTY_STATE_TMPL.format_map({
+        "icon": svg_icon(icon if icon in ICONS else "info"),
+        "message": escape(message)
+    })
 
 
+@lru_cache(maxsize=256)
 def render_badge(text: str, variant: str = "info") -> str:
     """Return HTML for a status badge."""
-    icon = {
-        "success": ICONS["check"],
-        "warning": ICONS["alert"],
-        "error": ICONS["alert"],
-        "info": ICONS["info"],
-    }.get(variant, ICONS["info"])
-    
-    return f"""
-    <span class="badge badge-{variant}">
-        {icon}
-        {text}
-    </span>
-    """
+    return _BADGE_TMPL.format_map({
+        "variant": variant,
+        "icon": _BADGE_ICONS.get(variant, _BADGE_ICONS["info"]),
+        "text": escape(text)
+    })
 
 
+@lru_cache(maxsize=256)
 def render_page_header(title: str, subtitle: str, icon_html: str = "") -> str:
     """Return HTML for a page header."""
-    return f"""
-    <div class="page-header">
-        <div class="page-title">
-            {icon_html}
-            <h1>{title}</h1>
-        </div>
-        <p class="page-subtitle">{subtitle}</p>
-    </div>
-    """
+    # icon_html is trusted markup from svg_icon; the text is escaped, once per cached argument tuple
+    return _PAGE_HEADER_TMPL.format_map({"icon_html": icon_html, "title": escape(title), "subtitle": escape(subtitle)})
+
+
+# Score color bands: below 0.2 gray, then purple, indigo, cyan, and green from 0.8
+_SCORE_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+_SCORE_COLORS = ("#64748b", "#8b5cf6", "#6366f1", "#06b6d4", "#10b981")
+_SCORE_THRESHOLDS_ARR = np.array(_SCORE_THRESHOLDS)
+_SCORE_COLORS_ARR = np.array(_SCORE_COLORS)
 
 
 def get_score_color(score: float) -> str:
     """Get gradient color based on similarity score."""
-    if score >= 0.8:
-        return "#10b981"  # Green
-    elif score >= 0.6:
-        return "#06b6d4"  # Cyan
-    elif score >= 0.4:
-        return "#6366f1"  # Indigo
-    elif score >= 0.2:
-        return "#8b5cf6"  # Purple
-    else:
-        return "#64748b"  # Gray
+    return _SCORE_COLORS[bisect_right(_SCORE_THRESHOLDS, score)]
+
+
+def get_score_colors(scores: Sequence[float]) -> np.ndarray:
+    """
+    Get gradient colors for many similarity scores at once.
+    
+    Args:
+        scores: Similarity scores
+    
+    Returns:
+        Array of hex color strings, one per score
+    """
+    return _SCORE_COLORS_ARR[np.searchsorted(_SCORE_THRESHOLDS_ARR, scores, side="right")]
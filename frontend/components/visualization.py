@@ -3,11 +3,11 @@ Visualization components using Plotly with progressive loading and rich animatio
 """
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 import numpy as np
 
-from frontend.components.styles import get_score_color
+from frontend.components.styles import get_score_colors
 
 
 # Color palette for gradient visualization
@@ -19,96 +19,158 @@ COLOR_PALETTE = [
     "#ec4899",  # Rose
 ]
 
+# Above this many points, word labels move to hover only; text layout dominates render cost
+MAX_LABELED_POINTS = 500
+
+# At this many points the frequency colorbar is hidden by default; hover still reports frequency
+MAX_COLORBAR_POINTS = 2000
+
+# Bar charts grow 35px per word up to this height, then bars narrow instead
+MAX_BAR_CHART_HEIGHT = 600
+
+
+# Layout keys shared by every chart; nested dicts are never mutated, only replaced
+_BASE_LAYOUT = MappingProxyType(dict(
+    paper_bgcolor="#1e293b",
+    plot_bgcolor="#0f172a",
+    font=dict(family="Inter, sans-serif", color="#94a3b8"),
+    margin=dict(l=60, r=40, t=60, b=60),
+    xaxis=dict(
+        gridcolor="#334155",
+        zerolinecolor="#334155",
+        title_font=dict(color="#94a3b8"),
+        tickfont=dict(color="#64748b"),
+    ),
+    yaxis=dict(
+        gridcolor="#334155",
+        zerolinecolor="#334155",
+        title_font=dict(color="#94a3b8"),
+        tickfont=dict(color="#64748b"),
+    ),
+    hoverlabel=dict(
+        bgcolor="#1e293b",
+        font_size=12,
+        font_family="Inter, sans-serif",
+        bordercolor="#6366f1",
+    ),
+    dragmode="zoom",  # Enable zoom by default
+    modebar=dict(
+        bgcolor="rgba(0,0,0,0)",
+        color="#64748b",
+        activecolor="#6366f1",
+    ),
+))
+
+_TITLE_FONT = MappingProxyType(dict(size=16, color="#f8fafc", family="Inter, sans-serif"))
+
+# Marker colorscales: by word frequency for the embedding scatter, by similarity for neighborhoods
+EMBED_COLORSCALE = (
+    (0.0, "#64748b"),
+    (0.25, "#6366f1"),
+    (0.5, "#8b5cf6"),
+    (0.75, "#a855f7"),
+    (1.0, "#06b6d4"),
+)
+
+NEIGHBOR_COLORSCALE = (
+    (0.0, "#64748b"),
+    (0.3, "#6366f1"),
+    (0.6, "#8b5cf6"),
+    (0.8, "#06b6d4"),
+    (1.0, "#10b981"),
+)
+
 
 def create_base_layout(title: str, height: int = 600) -> dict:
     """Create base layout configuration for all charts."""
-    return dict(
-        title=dict(
-            text=title,
-            x=0.5,
-            font=dict(size=16, color="#f8fafc", family="Inter, sans-serif")
-        ),
-        paper_bgcolor="#1e293b",
-        plot_bgcolor="#0f172a",
-        font=dict(family="Inter, sans-serif", color="#94a3b8"),
-        height=height,
-        margin=dict(l=60, r=40, t=60, b=60),
-        xaxis=dict(
-            gridcolor="#334155",
-            zerolinecolor="#334155",
-            title_font=dict(color="#94a3b8"),
-            tickfont=dict(color="#64748b"),
-        ),
-        yaxis=dict(
-            gridcolor="#334155",
-            zerolinecolor="#334155",
-            title_font=dict(color="#94a3b8"),
-            tickfont=dict(color="#64748b"),
-        ),
-        hoverlabel=dict(
-            bgcolor="#1e293b",
-            font_size=12,
-            font_family="Inter, sans-serif",
-            bordercolor="#6366f1",
-        ),
-        dragmode="zoom",  # Enable zoom by default
-        modebar=dict(
-            bgcolor="rgba(0,0,0,0)",
-            color="#64748b",
-            activecolor="#6366f1",
-        ),
+    return {
+        **_BASE_LAYOUT,
+        "title": dict(text=title, x=0.5, font=dict(_TITLE_FONT)),
+        "height": height,
+    }
+
+
+def _point_column(points: List[Dict], key: str, default: float = 0.0) -> np.ndarray:
+    """Collect one numeric field of the API points as float32, with missing or null values as default."""
+    return np.fromiter(
+        (default if (value := p.get(key)) is None else value for p in points),
+        dtype=np.float32,
+        count=len(points)
     )
 
 
+def _segments(start: float, ends: np.ndarray) -> np.ndarray:
+    """Interleave [start, end, nan] per end so one line trace draws every segment from start."""
+    coords = np.empty(3 * len(ends), dtype=np.float32)
+    coords[0::3] = start
+    coords[1::3] = ends
+    coords[2::3] = np.nan
+    return coords
+
+
 def plot_embeddings_scatter(
     data: Dict,
     highlight_words: Optional[List[str]] = None,
     title: Optional[str] = None,
     show_labels: bool = True,
-    animate: bool = True
+    animate: bool = True,
+    show_colorbar: Optional[bool] = None
 ) -> go.Figure:
     """
     Create an interactive scatter plot of word embeddings with gradient colors.
     
     Args:
-        data: API response with embedding points
+        data: API response with embedding points, as point dicts or a dict of columns
         highlight_words: Optional list of words to highlight
         title: Optional custom title
         show_labels: Whether to show word labels
         animate: Whether to animate points on load
+        show_colorbar: Whether to show the frequency colorbar; None shows it below MAX_COLORBAR_POINTS
     
     Returns:
         Plotly figure
     """
     if not data or "points" not in data:
-        fig = go.Figure()
-        fig.update_layout(**create_base_layout("No Data"))
-        fig.add_annotation(
-            text="No data available. Check your connection to the backend.",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=14, color="#94a3b8")
-        )
-        return fig
-    
-    # Create DataFrame
+        return go.Figure(layout={
+            **create_base_layout("No Data"),
+            "annotations": [dict(
+                text="No data available. Check your connection to the backend.",
+                xref="paper", yref="paper",
+                x=0.5, y=0.5, showarrow=False,
+                font=dict(size=14, color="#94a3b8")
+            )]
+        })
+    
+    # Plotted columns as arrays; masks then index only what each trace draws
     points = data["points"]
-    df = pd.DataFrame(points)
+    if isinstance(points, Mapping):
+        # Already columns (APIClient.get_embeddings)
+        x = np.asarray(points["x"], dtype=np.float32)
+        y = np.asarray(points["y"], dtype=np.float32)
+        words = np.asarray(points["word"], dtype=object)
+        frequency = np.asarray(points["frequency"], dtype=np.float32)
+    else:
+        x = _point_column(points, "x")
+        y = _point_column(points, "y")
+        words = np.array([p["word"] for p in points], dtype=object)
+        frequency = _point_column(points, "frequency", 0)
     
-    # Add highlight column
+    # Highlight mask
     if highlight_words:
-        highlight_words_lower = [w.lower() for w in highlight_words]
-        df["highlighted"] = df["word"].str.lower().isin(highlight_words_lower)
+        highlight_lower = {w.lower() for w in highlight_words}
+        highlighted = np.fromiter((w.lower() in highlight_lower for w in words), dtype=bool, count=len(words))
     else:
-        df["highlighted"] = False
+        highlighted = np.zeros(len(words), dtype=bool)
+    normal = ~highlighted
     
     # Normalize frequency for color and size
-    if "frequency" in df.columns and df["frequency"].max() > 0:
-        df["freq_norm"] = df["frequency"] / df["frequency"].max()
-        df["marker_size"] = 6 + df["freq_norm"] * 14
+    max_frequency = frequency.max(initial=0)
+    if max_frequency > 0:
+        freq_norm = frequency / max_frequency
+        marker_size = 6 + freq_norm * 14
     else:
-        df["freq_norm"] = 0.5
-        df["marker_size"] = 8
+        freq_norm = np.full(len(words), 0.5, dtype=np.float32)
+        marker_size = np.full(len(words), 8, dtype=np.float32)
     
     # Create figure
     model_type = data.get("model_type", "Unknown").upper()
@@ -117,26 +179,23 @@ def plot_embeddings_scatter(
     if title is None:
         title = f"<b>{model_type}</b> Embeddings ({method})"
     
-    fig = go.Figure()
-    
-    # Non-highlighted points with gradient color based on frequency
-    df_normal = df[~df["highlighted"]]
-    if len(df_normal) > 0:
-        fig.add_trace(go.Scatter(
-            x=df_normal["x"],
-            y=df_normal["y"],
-            mode="markers+text" if show_labels else "markers",
+    traces = []
+    
+    # Non-highlighted points with gradient color based on frequency; WebGL since "Load More" can reach thousands
+    normal_count = int(normal.sum())
+    if normal_count > 0:
+        use_text = show_labels and normal_count <= MAX_LABELED_POINTS
+        if show_colorbar is None:
+            show_colorbar = normal_count < MAX_COLORBAR_POINTS
+        traces.append(go.Scattergl(
+            x=x[normal],
+            y=y[normal],
+            mode="markers+text" if use_text else "markers",
             marker=dict(
-                size=df_normal["marker_size"],
-                color=df_normal["freq_norm"],
-                colorscale=[
-                    [0.0, "#64748b"],
-                    [0.25, "#6366f1"],
-                    [0.5, "#8b5cf6"],
-                    [0.75, "#a855f7"],
-                    [1.0, "#06b6d4"],
-                ],
-                showscale=True,
+                size=marker_size[normal],
+                color=freq_norm[normal],
+                colorscale=EMBED_COLORSCALE,
+                showscale=show_colorbar,
                 colorbar=dict(
                     title=dict(text="Frequency", side="right", font=dict(color="#94a3b8")),
                     tickfont=dict(color="#94a3b8"),
@@ -145,7 +204,7 @@ def plot_embeddings_scatter(
                 opacity=0.8,
                 line=dict(width=1, color="rgba(255,255,255,0.2)")
             ),
-            text=df_normal["word"] if show_labels else None,
+            text=words[normal],  # always set so the hovertemplate's %{text} resolves
             textposition="top center",
             textfont=dict(size=9, color="#94a3b8"),
             hovertemplate=(
@@ -154,16 +213,16 @@ def plot_embeddings_scatter(
                 "<span style='color:#94a3b8;'>Frequency:</span> %{customdata}<br>"
                 "<extra></extra>"
             ),
-            customdata=df_normal.get("frequency", [0] * len(df_normal)),
+            customdata=frequency[normal],
             name="Words",
         ))
     
-    # Highlighted points
-    df_highlight = df[df["highlighted"]]
-    if len(df_highlight) > 0:
-        fig.add_trace(go.Scatter(
-            x=df_highlight["x"],
-            y=df_highlight["y"],
+    # Highlighted points; also WebGL, since plotly paints the WebGL canvas over SVG traces,
+    # and appended after "Words" so the stars draw on top of it
+    if highlighted.any():
+        traces.append(go.Scattergl(
+            x=x[highlighted],
+            y=y[highlighted],
             mode="markers+text",
             marker=dict(
                 size=16,
@@ -171,7 +230,7 @@ def plot_embeddings_scatter(
                 symbol="star",
                 line=dict(width=2, color="#fca5a5")
             ),
-            text=df_highlight["word"],
+            text=words[highlighted],
             textposition="top center",
             textfont=dict(size=11, color="#ef4444", family="Inter, sans-serif"),
             hovertemplate=(
@@ -198,19 +257,17 @@ def plot_embeddings_scatter(
             bgcolor="rgba(0,0,0,0)",
         ),
         hovermode="closest",
-    )
-    fig.update_layout(**layout)
-    
-    # Add annotations for controls
-    fig.add_annotation(
-        text="Scroll to zoom • Drag to pan • Double-click to reset",
-        xref="paper", yref="paper",
-        x=0.5, y=-0.12,
-        showarrow=False,
-        font=dict(size=10, color="#64748b"),
+        # Hint for the zoom and pan controls
+        annotations=[dict(
+            text="Scroll to zoom • Drag to pan • Double-click to reset",
+            xref="paper", yref="paper",
+            x=0.5, y=-0.12,
+            showarrow=False,
+            font=dict(size=10, color="#64748b"),
+        )],
     )
     
-    return fig
+    return go.Figure(data=traces, layout=layout)
 
 
 def plot_word_neighborhood(
@@ -230,15 +287,15 @@ def plot_word_neighborhood(
         Plotly figure
     """
     if not data or "points" not in data:
-        fig = go.Figure()
-        fig.update_layout(**create_base_layout("No Data", height=500))
-        fig.add_annotation(
-            text="Word not found in vocabulary",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=14, color="#f59e0b")
-        )
-        return fig
+        return go.Figure(layout={
+            **create_base_layout("No Data", height=500),
+            "annotations": [dict(
+                text="Word not found in vocabulary",
+                xref="paper", yref="paper",
+                x=0.5, y=0.5, showarrow=False,
+                font=dict(size=14, color="#f59e0b")
+            )]
+        })
     
     points = data["points"]
     query_word = data.get("query_word", "word")
@@ -246,54 +303,56 @@ def plot_word_neighborhood(
     if title is None:
         title = f"Neighborhood of <b>{query_word}</b>"
     
-    # Create DataFrame
-    df = pd.DataFrame(points)
+    # Plotted columns as arrays, split into the query word and its neighbors
+    x = _point_column(points, "x")
+    y = _point_column(points, "y")
+    words = np.array([p["word"] for p in points], dtype=object)
+    similarities = _point_column(points, "similarity", 0.5)
+    is_query = np.fromiter((bool(p.get("is_query", False)) for p in points), dtype=bool, count=len(points))
+    neighbors = ~is_query
+    neighbor_count = int(neighbors.sum())
     
-    # Separate query word and neighbors
-    df_query = df[df.get("is_query", False) == True]
-    df_neighbors = df[df.get("is_query", False) == False]
-    
-    fig = go.Figure()
+    traces = []
     
     # Draw connection lines from query to neighbors
-    if len(df_query) > 0 and len(df_neighbors) > 0:
-        query_x = df_query["x"].values[0]
-        query_y = df_query["y"].values[0]
+    if is_query.any() and neighbor_count > 0:
+        query_x = x[is_query][0]
+        query_y = y[is_query][0]
+        
+        neighbor_x = x[neighbors]
+        neighbor_y = y[neighbors]
+        line_similarities = similarities[neighbors]
+        line_colors = get_score_colors(line_similarities)
         
-        for _, row in df_neighbors.iterrows():
-            similarity = row.get("similarity", 0.5)
-            color = get_score_color(similarity)
-            opacity = max(0.3, similarity)
+        # One trace per score color band, weakest first so stronger lines draw on top;
+        # each is a polyline broken by NaN: [qx, nx, nan, qx, nx2, nan, ...]
+        for color in dict.fromkeys(line_colors[np.argsort(line_similarities)]):
+            in_band = line_colors == color
+            band_similarity = float(line_similarities[in_band].mean())
             
-            fig.add_trace(go.Scatter(
-                x=[query_x, row["x"]],
-                y=[query_y, row["y"]],
+            traces.append(go.Scatter(
+                x=_segments(query_x, neighbor_x[in_band]),
+                y=_segments(query_y, neighbor_y[in_band]),
                 mode="lines",
-                line=dict(color=color, width=1 + similarity * 2),
-                opacity=opacity,
+                line=dict(color=color, width=1 + band_similarity * 2),
+                opacity=max(0.3, band_similarity),
                 hoverinfo="skip",
                 showlegend=False
             ))
     
-    # Neighbor points with gradient based on similarity
-    if len(df_neighbors) > 0:
-        similarities = df_neighbors.get("similarity", pd.Series([0.5] * len(df_neighbors)))
-        sizes = 8 + similarities * 12
+    # Neighbor points with gradient based on similarity; WebGL, which plotly paints over the SVG lines
+    if neighbor_count > 0:
+        neighbor_similarities = similarities[neighbors]
+        sizes = 8 + neighbor_similarities * 12
         
-        fig.add_trace(go.Scatter(
-            x=df_neighbors["x"],
-            y=df_neighbors["y"],
-            mode="markers+text",
+        traces.append(go.Scattergl(
+            x=x[neighbors],
+            y=y[neighbors],
+            mode="markers+text" if neighbor_count <= MAX_LABELED_POINTS else "markers",
             marker=dict(
                 size=sizes,
-                color=similarities,
-                colorscale=[
-                    [0.0, "#64748b"],
-                    [0.3, "#6366f1"],
-                    [0.6, "#8b5cf6"],
-                    [0.8, "#06b6d4"],
-                    [1.0, "#10b981"],
-                ],
+                color=neighbor_similarities,
+                colorscale=NEIGHBOR_COLORSCALE,
                 showscale=True,
                 colorbar=dict(
                     title=dict(text="Similarity", side="right", font=dict(color="#94a3b8")),
@@ -301,22 +360,23 @@ def plot_word_neighborhood(
                 ),
                 line=dict(width=1, color="rgba(255,255,255,0.3)")
             ),
-            text=df_neighbors["word"],
+            text=words[neighbors],
             textposition="top center",
             textfont=dict(size=10, color="#f8fafc"),
             hovertemplate=(
                 "<b>%{text}</b><br>"
-                "Similarity: %{marker.color:.4f}<br>"
+                "Similarity: %{customdata:.4f}<br>"
                 "<extra></extra>"
             ),
+            customdata=neighbor_similarities,
             name="Neighbors"
         ))
     
-    # Query word point (center/focus)
-    if len(df_query) > 0:
-        fig.add_trace(go.Scatter(
-            x=df_query["x"],
-            y=df_query["y"],
+    # Query word point (center/focus); also WebGL and appended last, so it draws over the neighbors
+    if is_query.any():
+        traces.append(go.Scattergl(
+            x=x[is_query],
+            y=y[is_query],
             mode="markers+text",
             marker=dict(
                 size=24,
@@ -324,7 +384,7 @@ def plot_word_neighborhood(
                 symbol="star",
                 line=dict(width=2, color="#fca5a5")
             ),
-            text=df_query["word"],
+            text=words[is_query],
             textposition="top center",
             textfont=dict(size=12, color="#ef4444", family="Inter, sans-serif"),
             hovertemplate="<b>%{text}</b> (Query)<extra></extra>",
@@ -346,9 +406,8 @@ def plot_word_neighborhood(
             font=dict(color="#94a3b8"),
         ),
     )
-    fig.update_layout(**layout)
     
-    return fig
+    return go.Figure(data=traces, layout=layout)
 
 
 def plot_comparison(
@@ -363,17 +422,14 @@ def plot_comparison(
     Returns:
         Tuple of two Plotly figures
     """
-    fig1 = plot_embeddings_scatter(data1, title=f"<b>{label1}</b>", show_labels=False)
-    fig2 = plot_embeddings_scatter(data2, title=f"<b>{label2}</b>", show_labels=False)
+    # No colorbar in the comparison view
+    fig1 = plot_embeddings_scatter(data1, title=f"<b>{label1}</b>", show_labels=False, show_colorbar=False)
+    fig2 = plot_embeddings_scatter(data2, title=f"<b>{label2}</b>", show_labels=False, show_colorbar=False)
     
     # Make them smaller for side-by-side
     fig1.update_layout(height=450, showlegend=False)
     fig2.update_layout(height=450, showlegend=False)
     
-    # Remove colorbar for comparison view
-    fig1.update_traces(marker=dict(showscale=False), selector=dict(name="Words"))
-    fig2.update_traces(marker=dict(showscale=False), selector=dict(name="Words"))
-    
     return fig1, fig2
 
 
@@ -389,17 +445,13 @@ def create_similarity_bar_chart(similar_words: List[Dict], query_word: str) -> g
         Plotly figure
     """
     if not similar_words:
-        fig = go.Figure()
-        fig.update_layout(**create_base_layout("No Results", height=300))
-        return fig
+        return go.Figure(layout=create_base_layout("No Results", height=300))
     
     words = [w["word"] for w in similar_words]
     scores = [w["similarity"] for w in similar_words]
-    colors = [get_score_color(s) for s in scores]
+    colors = get_score_colors(scores).tolist()
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Bar(
+    bar = go.Bar(
         x=scores,
         y=words,
         orientation='h',
@@ -408,13 +460,13 @@ def create_similarity_bar_chart(similar_words: List[Dict], query_word: str) -> g
             line=dict(width=0),
             cornerradius=4,
         ),
-        text=[f"{s:.3f}" for s in scores],
+        texttemplate="%{x:.3f}",  # formatted in the browser rather than shipped as a string array
         textposition='outside',
         textfont=dict(color="#f8fafc", size=11),
         hovertemplate="<b>%{y}</b><br>Similarity: %{x:.4f}<extra></extra>",
-    ))
+    )
     
-    layout = create_base_layout(f"Similar to <b>{query_word}</b>", height=max(250, len(words) * 35))
+    layout = create_base_layout(f"Similar to <b>{query_word}</b>", height=min(MAX_BAR_CHART_HEIGHT, max(250, len(words) * 35)))
     layout.update(
         xaxis_title="Cosine Similarity",
         yaxis=dict(
@@ -427,6 +479,5 @@ def create_similarity_bar_chart(similar_words: List[Dict], query_word: str) -> g
         ),
         bargap=0.4,
     )
-    fig.update_layout(**layout)
     
-    return fig
+    return go.Figure(data=[bar], layout=layout)
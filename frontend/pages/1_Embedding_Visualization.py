@@ -11,8 +11,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from components.sidebar import render_sidebar
-from components.visualization import plot_embeddings_scatter
-from components.styles import GLOBAL_STYLES, ICONS, render_page_header, render_loading
+from components.visualization import MAX_COLORBAR_POINTS, plot_embeddings_scatter
+from components.styles import global_styles, render_page_header, render_loading, svg_icon
 from utils.api_client import get_api_client
 
 # Page config
@@ -23,7 +23,7 @@ st.set_page_config(
 )
 
 # Apply styles
-st.markdown(GLOBAL_STYLES, unsafe_allow_html=True)
+st.markdown(global_styles(), unsafe_allow_html=True)
 
 
 def main():
@@ -36,7 +36,7 @@ def main():
     st.markdown(render_page_header(
         title="Embedding Visualization",
         subtitle="Explore word embeddings in 2D space with interactive zoom and progressive loading",
-        icon_html=f'<div style="color: var(--primary);">{ICONS["chart"]}</div>'
+        icon_html=f'<div style="color: var(--primary);">{svg_icon("chart")}</div>'
     ), unsafe_allow_html=True)
     
     # API client
@@ -59,6 +59,12 @@ def main():
         # Display options using native expander
         with st.expander("⚙️ Display Options", expanded=True):
             show_labels = st.checkbox("Show word labels", value=True, key="show_labels")
+            show_colorbar = st.checkbox(
+                "Show colorbar",
+                value=True,
+                key="show_colorbar",
+                help=f"Hidden automatically at {MAX_COLORBAR_POINTS:,} points"
+            )
         
         # Top words section using native expander
         with st.expander("📚 Top Words in Model", expanded=True):
@@ -70,106 +76,161 @@ def main():
                 st.markdown(f'<div style="display: flex; flex-wrap: wrap; gap: 0.25rem;">{chips_html}</div>', unsafe_allow_html=True)
     
     with col_main:
-        # Progressive loading controls
-        col1, col2, col3 = st.columns([2, 2, 1])
-        
-        with col1:
-            current_words = st.session_state.get("current_word_count", params["initial_words"])
-            st.markdown(f"""
-            <div style="color: var(--text-secondary); font-size: 0.9rem;">
-                Showing <span style="color: var(--primary); font-weight: 600;">{current_words}</span> words
-                (max: {params["max_words"]})
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            load_more_col, reset_col = st.columns(2)
-            with load_more_col:
-                if st.button("Load More Points", key="load_more", use_container_width=True):
-                    new_count = min(current_words + 200, params["max_words"])
-                    st.session_state.current_word_count = new_count
-                    st.rerun()
-            with reset_col:
-                if st.button("Reset View", key="reset", use_container_width=True):
-                    st.session_state.current_word_count = params["initial_words"]
-                    st.rerun()
+        _render_chart(params, highlight_words, show_labels, show_colorbar)
+
+
+@st.fragment
+def _render_chart(params: dict, highlight_words: list, show_labels: bool, show_colorbar: bool):
+    """
+    Progressive loading controls and the scatter plot.
+    
+    Runs as a fragment, so Load More and Reset View rerun only the chart,
+    not the sidebar and side panel.
+    """
+    # Progressive loading controls; buttons are handled before the count is shown, so no rerun is needed
+    col1, col2, col3 = st.columns([2, 2, 1])
+    
+    with col2:
+        load_more_col, reset_col = st.columns(2)
+        with load_more_col:
+            if st.button("Load More Points", key="load_more", use_container_width=True):
+                current_words = st.session_state.get("current_word_count", params["initial_words"])
+                st.session_state.current_word_count = min(current_words + 200, params["max_words"])
+        with reset_col:
+            if st.button("Reset View", key="reset", use_container_width=True):
+                st.session_state.current_word_count = params["initial_words"]
+    
+    # Determine number of words to load
+    num_words = st.session_state.get("current_word_count", params["initial_words"])
+    
+    with col1:
+        st.markdown(f"""
+        <div style="color: var(--text-secondary); font-size: 0.9rem;">
+            Showing <span style="color: var(--primary); font-weight: 600;">{num_words}</span> words
+            (max: {params["max_words"]})
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Show loading state
+    loading_placeholder = st.empty()
+    chart_placeholder = st.empty()
+    
+    # Display loading animation
+    with loading_placeholder:
+        st.markdown(render_loading(f"Loading {num_words} word embeddings..."), unsafe_allow_html=True)
+    
+    # Fetch embeddings
+    data = _fetch_embeddings(params, num_words)
+    
+    # Clear loading
+    loading_placeholder.empty()
+    
+    if data and "points" in data:
+        # Store current count
+        st.session_state.current_word_count = data['num_words']
         
-        # Determine number of words to load
-        num_words = st.session_state.get("current_word_count", params["initial_words"])
+        # Success message
+        st.markdown(f"""
+        <div class="badge badge-success" style="margin-bottom: 1rem;">
+            {svg_icon('check')}
+            Loaded {data['num_words']} words
+        </div>
+        """, unsafe_allow_html=True)
         
-        # Show loading state
-        loading_placeholder = st.empty()
-        chart_placeholder = st.empty()
+        # Create visualization
+        with chart_placeholder:
+            fig = plot_embeddings_scatter(
+                data,
+                highlight_words=highlight_words if highlight_words else None,
+                show_labels=show_labels,
+                show_colorbar=None if show_colorbar else False
+            )
+            st.plotly_chart(fig, use_container_width=True, config={
+                'displayModeBar': True,
+                'displaylogo': False,
+                'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
+                'scrollZoom': True,
+            })
         
-        # Display loading animation
-        with loading_placeholder:
-            st.markdown(render_loading(f"Loading {num_words} word embeddings..."), unsafe_allow_html=True)
+        # Info section
+        with st.expander("About this visualization"):
+            st.markdown(f"""
+            **Model:** {params['model_type'].upper()}  
+            **Reduction:** {params['reduction_method'].upper()}  
+            **Points:** {data['num_words']}
+            
+            **Interaction Tips:**
+            - **Scroll** to zoom in/out
+            - **Drag** to pan around
+            - **Double-click** to reset view
+            - **Hover** over points for details
+            - **Box zoom** by clicking the zoom tool
+            
+            **Color Meaning:**
+            - Darker colors = less frequent words
+            - Brighter colors = more frequent words
+            - Red stars = highlighted words
+            """)
+    else:
+        chart_placeholder.markdown("""
+        <div class="empty-state">
+            <p style="color: var(--danger);">Failed to load embeddings</p>
+            <p style="font-size: 0.9rem; color: var(--text-muted);">
+                Make sure the backend is running at http://127.0.0.1:8000
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+        return
+    
+    # The first paint is already on screen; fetch the rest now so Load More can slice it
+    if params["reduction_method"] == "pca" and num_words < params["max_words"]:
+        _fetch_embeddings(params, params["max_words"])
+        st.session_state._prefetched_embeddings = _prefetch_key(params)
+
+
+def _prefetch_key(params: dict) -> tuple:
+    """Identify the full max_words response a PCA chart can be sliced from."""
+    return (params["model_type"], params["max_words"], params["perplexity"])
+
+
+def _fetch_embeddings(params: dict, num_words: int) -> dict:
+    """
+    Fetch `num_words` points for the chart.
+    
+    PCA projects the top words by frequency onto one basis per model, so any count
+    is a prefix of the max_words response. Once that response has been prefetched,
+    smaller counts are sliced from it instead of calling the API again. t-SNE
+    layouts depend on the point set, so those are always fetched per count.
+    
+    Args:
+        params: Sidebar parameters
+        num_words: Number of points to return
         
-        # Fetch embeddings
-        data = api.get_embeddings(
+    Returns:
+        Embeddings response, or an empty dict on failure
+    """
+    api = get_api_client()
+    if (
+        params["reduction_method"] == "pca"
+        and num_words < params["max_words"]
+        and st.session_state.get("_prefetched_embeddings") == _prefetch_key(params)
+    ):
+        full = api.get_embeddings(
             model_type=params["model_type"],
-            method=params["reduction_method"],
-            num_words=num_words,
+            method="pca",
+            num_words=params["max_words"],
             perplexity=params["perplexity"]
         )
-        
-        # Clear loading
-        loading_placeholder.empty()
-        
-        if data and "points" in data:
-            # Store current count
-            st.session_state.current_word_count = len(data['points'])
-            
-            # Success message
-            st.markdown(f"""
-            <div class="badge badge-success" style="margin-bottom: 1rem;">
-                {ICONS['check']}
-                Loaded {len(data['points'])} words
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Create visualization
-            with chart_placeholder:
-                fig = plot_embeddings_scatter(
-                    data,
-                    highlight_words=highlight_words if highlight_words else None,
-                    show_labels=show_labels
-                )
-                st.plotly_chart(fig, use_container_width=True, config={
-                    'displayModeBar': True,
-                    'displaylogo': False,
-                    'modeBarButtonsToRemove': ['lasso2d', 'select2d'],
-                    'scrollZoom': True,
-                })
-            
-            # Info section
-            with st.expander("About this visualization"):
-                st.markdown(f"""
-                **Model:** {params['model_type'].upper()}  
-                **Reduction:** {params['reduction_method'].upper()}  
-                **Points:** {len(data['points'])}
-                
-                **Interaction Tips:**
-                - **Scroll** to zoom in/out
-                - **Drag** to pan around
-                - **Double-click** to reset view
-                - **Hover** over points for details
-                - **Box zoom** by clicking the zoom tool
-                
-                **Color Meaning:**
-                - Darker colors = less frequent words
-                - Brighter colors = more frequent words
-                - Red stars = highlighted words
-                """)
-        else:
-            chart_placeholder.markdown("""
-            <div class="empty-state">
-                <p style="color: var(--danger);">Failed to load embeddings</p>
-                <p style="font-size: 0.9rem; color: var(--text-muted);">
-                    Make sure the backend is running at http://127.0.0.1:8000
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+        if full and "points" in full:
+            points = {key: column[:num_words] for key, column in full["points"].items()}
+            return {**full, "points": points, "num_words": len(points["word"])}
+    
+    return api.get_embeddings(
+        model_type=params["model_type"],
+        method=params["reduction_method"],
+        num_words=num_words,
+        perplexity=params["perplexity"]
+    )
 
 
 if __name__ == "__main__":
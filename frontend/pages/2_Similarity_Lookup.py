@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from components.sidebar import render_sidebar
 from components.visualization import plot_word_neighborhood, create_similarity_bar_chart
 from components.similarity_panel import render_similarity_results, render_word_chips
-from components.styles import GLOBAL_STYLES, ICONS, render_page_header, render_loading
+from components.styles import global_styles, render_page_header, render_loading, svg_icon
 from utils.api_client import get_api_client
 
 # Page config
@@ -24,20 +24,28 @@ st.set_page_config(
 )
 
 # Apply styles
-st.markdown(GLOBAL_STYLES, unsafe_allow_html=True)
+st.markdown(global_styles(), unsafe_allow_html=True)
+
+
+def _select_suggestion():
+    """Queue the clicked suggestion for search and clear the pill selection."""
+    word = st.session_state.suggestion_pills
+    if word is not None:
+        st.session_state.selected_suggestion = word
+    st.session_state.suggestion_pills = None
 
 
 def main():
     """Main page function."""
     
     # Render sidebar and get parameters
-    params = render_sidebar()
+    params = render_sidebar(rerun_on=("model_type", "reduction_method"))
     
     # Page header
     st.markdown(render_page_header(
         title="Similarity Lookup",
         subtitle="Find semantically similar words using cosine similarity across embedding models",
-        icon_html=f'<div style="color: var(--accent);">{ICONS["search"]}</div>'
+        icon_html=f'<div style="color: var(--accent);">{svg_icon("search")}</div>'
     ), unsafe_allow_html=True)
     
     # API client
@@ -82,17 +90,15 @@ def main():
         with st.expander("⚡ Try These Words", expanded=True):
             sample_words = api.get_vocabulary_sample(params["model_type"], 12)
             if sample_words and "sample_words" in sample_words:
-                words = sample_words["sample_words"][:12]
-                
-                # Display in rows of 3 using columns (wider to avoid text wrapping)
-                for i in range(0, len(words), 3):
-                    row_words = words[i:i+3]
-                    cols = st.columns(3)
-                    for j, word in enumerate(row_words):
-                        with cols[j]:
-                            if st.button(word, key=f"sug_{i}_{j}", use_container_width=True):
-                                st.session_state.selected_suggestion = word
-                                st.rerun()
+                # One pills widget instead of a button per word; the click reruns on its own
+                st.pills(
+                    "Suggestions",
+                    sample_words["sample_words"][:12],
+                    key="suggestion_pills",
+                    on_change=_select_suggestion,
+                    label_visibility="collapsed",
+                    width="stretch"
+                )
     
     with col_results:
         if query_word and search_clicked:
@@ -134,14 +140,14 @@ def main():
             # Show initial state with hint
             st.markdown(f"""
             <div class="empty-state" style="padding: 4rem 2rem;">
-                <div style="color: var(--primary); margin-bottom: 1rem;">{ICONS['search']}</div>
+                <div style="color: var(--primary); margin-bottom: 1rem;">{svg_icon('search')}</div>
                 <p>Click "Find Similar Words" to search</p>
             </div>
             """, unsafe_allow_html=True)
         else:
             st.markdown(f"""
             <div class="empty-state" style="padding: 4rem 2rem;">
-                <div style="color: var(--text-muted); margin-bottom: 1rem;">{ICONS['search']}</div>
+                <div style="color: var(--text-muted); margin-bottom: 1rem;">{svg_icon('search')}</div>
                 <p>Enter a word to find similar words</p>
                 <p style="font-size: 0.85rem; color: var(--text-muted);">Or click one of the suggestions</p>
             </div>
@@ -152,7 +158,7 @@ def main():
     
     st.markdown(f"""
     <div style="display: flex; align-items: center; gap: 0.75rem; margin-bottom: 1rem;">
-        <div style="color: var(--secondary);">{ICONS['target']}</div>
+        <div style="color: var(--secondary);">{svg_icon('target')}</div>
         <span style="color: var(--text-primary); font-weight: 600; font-size: 1.1rem;">Word Neighborhood</span>
     </div>
     """, unsafe_allow_html=True)
@@ -1,10 +1,19 @@
 """
 API client for communicating with the FastAPI backend.
 """
+import base64
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
 import requests
-from typing import Optional, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List, Tuple
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
 
 # Backend API URL - can be configured via environment variable or Streamlit secrets
 API_BASE_URL = os.getenv(
@@ -13,47 +22,109 @@ API_BASE_URL = os.getenv(
 )
 
 
+# (connect, read) timeouts in seconds; an unreachable host fails fast, slow t-SNE runs still finish
+REQUEST_TIMEOUT = (5, 60)
+
+
+class _CircuitBreaker:
+    """
+    Stops calling a backend that keeps failing to connect, for a cooldown.
+    
+    Only connection errors and connect timeouts count; an HTTP error or a read
+    timeout still means the backend answered. Failures are not reset when the breaker opens, so the
+    first call after the cooldown reopens it at once if the backend is still down.
+    """
+    
+    def __init__(self, threshold: int = 2, cooldown: float = 15.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+    
+    def remaining(self) -> float:
+        """Seconds left in the cooldown; 0 when calls may go through."""
+        return max(0.0, self._open_until - time.monotonic())
+    
+    def record(self, reached: bool):
+        """Record whether a call reached the backend."""
+        with self._lock:
+            if reached:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.threshold:
+                self._open_until = time.monotonic() + self.cooldown
+
+
 class APIClient:
     """Client for interacting with the Embedding Explorer API."""
     
     def __init__(self, base_url: str = API_BASE_URL):
         self.base_url = base_url
+        self.session = _get_session()
+        self.breaker = _get_breaker(base_url)
+    
+    def _backend_down(self) -> bool:
+        """Report and skip a call while the circuit breaker is open."""
+        remaining = self.breaker.remaining()
+        if remaining:
+            st.error(f"❌ Backend unavailable. Retrying in {remaining:.0f}s.")
+        return bool(remaining)
     
     def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make a GET request to the API."""
+        if self._backend_down():
+            return {}
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}{endpoint}",
                 params=params,
-                timeout=60
+                timeout=REQUEST_TIMEOUT
             )
+            self.breaker.record(True)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.ConnectionError:
+            self.breaker.record(False)
             st.error("❌ Cannot connect to backend. Make sure the FastAPI server is running.")
             return {}
         except requests.exceptions.Timeout:
             st.error("⏱️ Request timed out. The operation took too long.")
             return {}
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             st.error(f"🚫 API Error: {str(e)}")
             return {}
     
+    def _get_cached(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Make a GET request, memoized across reruns and sessions; failures are not cached."""
+        try:
+            return _cached_get(self.base_url, endpoint, tuple(sorted((params or {}).items())))
+        except _UncachedResponse as e:
+            return e.response
+    
     def _post(self, endpoint: str, data: Any, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Make a POST request to the API."""
+        if self._backend_down():
+            return {}
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}{endpoint}",
                 json=data,
                 params=params,
-                timeout=60
+                timeout=REQUEST_TIMEOUT
             )
+            self.breaker.record(True)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.ConnectionError:
+            self.breaker.record(False)
             st.error("❌ Cannot connect to backend. Make sure the FastAPI server is running.")
             return {}
-        except requests.exceptions.RequestException as e:
+        except requests.exceptions.Timeout:
+            st.error("⏱️ Request timed out. The operation took too long.")
+            return {}
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             st.error(f"🚫 API Error: {str(e)}")
             return {}
     
@@ -68,7 +139,7 @@ class APIClient:
     
     def get_vocabulary_sample(self, model_type: str, sample_size: int = 50) -> Dict:
         """Get sample words from vocabulary."""
-        return self._get(f"/models/{model_type}/vocabulary", {"sample_size": sample_size})
+        return self._get_cached(f"/models/{model_type}/vocabulary", {"sample_size": sample_size})
     
     def check_word(self, model_type: str, word: str) -> Dict:
         """Check if word exists in vocabulary."""
@@ -82,14 +153,14 @@ class APIClient:
         topn: int = 10
     ) -> Dict:
         """Get similar words for a query word."""
-        return self._get(
+        return self._get_cached(
             f"/similarity/word/{word}",
             {"model_type": model_type, "topn": topn}
         )
     
     def compare_similarity(self, word: str, topn: int = 10) -> Dict:
         """Compare similarity across all models."""
-        return self._get(f"/similarity/compare/{word}", {"topn": topn})
+        return self._get_cached(f"/similarity/compare/{word}", {"topn": topn})
     
     # Embedding endpoints
     def get_embeddings(
@@ -99,15 +170,36 @@ class APIClient:
         num_words: int = 500,
         perplexity: int = 30
     ) -> Dict:
-        """Get 2D embeddings for visualization."""
-        return self._get(
+        """Get 2D embeddings for visualization, with points as NumPy columns."""
+        # Parallel arrays drop the per-point keys, and float16 coordinates shrink the rest
+        return _embedding_columns(self._get_cached(
             f"/embeddings/{model_type}",
             {
                 "method": method,
                 "num_words": num_words,
-                "perplexity": perplexity
+                "perplexity": perplexity,
+                "columnar": "true",
+                "quantize": "true"
             }
-        )
+        ))
+    
+    def get_embeddings_many(self, *specs: Dict[str, Any]) -> List[Dict]:
+        """
+        Fetch several embedding sets concurrently, one thread per request.
+        
+        Args:
+            specs: get_embeddings keyword arguments, one dict per request
+        
+        Returns:
+            Responses in the same order as specs
+        """
+        # Workers share the script context so cached calls and st.error still work
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(
+            max_workers=len(specs),
+            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+        ) as pool:
+            return list(pool.map(lambda spec: self.get_embeddings(**spec), specs))
     
     def get_word_neighborhood(
         self,
@@ -117,14 +209,109 @@ class APIClient:
         num_neighbors: int = 20
     ) -> Dict:
         """Get word neighborhood for visualization."""
-        return self._get(
+        return self._get_cached(
             f"/embeddings/{model_type}/neighborhood/{word}",
             {"method": method, "num_neighbors": num_neighbors}
         )
 
 
+def _embedding_columns(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace an embeddings response's points with NumPy columns.
+    
+    data["points"] becomes {"word", "x", "y", "frequency"} arrays, so plotting
+    indexes columns instead of walking point dicts. Float16 coordinates are
+    widened here, and row responses from a backend without the columnar or
+    quantize options are gathered once; failures pass through.
+    """
+    columns = data.get("points_columnar")
+    if not columns:
+        if "points" not in data:
+            return data
+        points = data["points"]
+        columns = {
+            "words": [p["word"] for p in points],
+            "x": [p["x"] for p in points],
+            "y": [p["y"] for p in points],
+            "frequencies": [p.get("frequency", 0) for p in points],
+        }
+    
+    if columns.get("xy_f16"):
+        # Quantized (x, y) pairs, widened to the float32 the charts plot
+        xy = np.frombuffer(base64.b64decode(columns["xy_f16"]), dtype="<f2").reshape(-1, 2)
+        x, y = np.ascontiguousarray(xy.T, dtype=np.float32)
+    else:
+        x = np.asarray(columns["x"], dtype=np.float32)
+        y = np.asarray(columns["y"], dtype=np.float32)
+    
+    return {
+        **data,
+        "num_words": len(columns["words"]),
+        "points": {
+            "word": np.array(columns["words"], dtype=object),
+            "x": x,
+            "y": y,
+            "frequency": np.asarray(columns["frequencies"], dtype=np.float32),
+        },
+        "points_columnar": None,
+    }
+
+
+class _UncachedResponse(Exception):
+    """Carries a failed or empty response out of _cached_get so it isn't stored."""
+    
+    def __init__(self, response: Dict[str, Any]):
+        super().__init__()
+        self.response = response
+
+
+@st.cache_data(ttl=24 * 60 * 60, max_entries=128, show_spinner=False)
+def _cached_get(base_url: str, endpoint: str, params: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+    """GET through APIClient._get, keyed by URL and sorted params; exceptions are never cached."""
+    response = APIClient(base_url)._get(endpoint, dict(params))
+    if not response:
+        raise _UncachedResponse(response)
+    return response
+
+
+@st.cache_resource
+def _get_session() -> requests.Session:
+    """Keep-alive connection pool shared by every APIClient, including those built by _cached_get."""
+    session = requests.Session()
+    # Retry only covers idempotent methods by default, so POSTs are never resent;
+    # a read timeout is not retried either, or a slow t-SNE run would be started again,
+    # and neither is a failed connect, so an unreachable host fails within REQUEST_TIMEOUT
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, connect=0, read=False, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def _get_breaker(base_url: str) -> _CircuitBreaker:
+    """Circuit breaker per backend, shared by every APIClient and session."""
+    return _CircuitBreaker()
+
+
 # Cached API client instance
 @st.cache_resource
 def get_api_client() -> APIClient:
     """Get cached API client instance."""
-    return APIClient()
+    client = APIClient()
+    # Opens a pooled keep-alive socket and wakes the backend before the first real request.
+    # Pages and components import this module under different names, each copy with its
+    # own session, so each copy warms its own pool once.
+    threading.Thread(target=_warm_up, args=(client,), daemon=True).start()
+    return client
+
+
+def _warm_up(client: APIClient):
+    """Best-effort GET off the script thread; bypasses _get so a cold backend shows no error and leaves the breaker alone."""
+    try:
+        client.session.get(f"{client.base_url}/models", timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException:
+        pass